@@ -2,27 +2,13 @@ import argparse
 from objects.model import XGBoostModel
 from objects.model_reload import model_retrain
 from objects.current_state import current_state
-import datetime 
-import pickle
-import os
+from objects.season_store import season_store
+from objects.transport import nba_transport, TRANSPORT_MODES
 
 def updater():
-    if not (os.path.exists("data/current_state_object.pickle")):
-        print("Data is being downloaded - downloading - this will take ~1 min and will only be done once...")
-        now = current_state()
-        with open('data/current_state_object.pickle', 'wb') as handle:
-            pickle.dump(now, handle, protocol=pickle.HIGHEST_PROTOCOL)
-    else:
-        with open('data/current_state_object.pickle', 'rb') as handle:
-            now = pickle.load(handle) # Note that all updates are done within object, so if time has passed between uses thats ok
-
-    # Update if its a new season
-    if ((now.year != datetime.datetime.now().year - 1) & (datetime.datetime.now().month <= 8)) or ((now.year == datetime.datetime.now().year) & (datetime.datetime.now().month > 8)):
-        "Data loaded is from last season! Downloading data from this year - this will take ~1 min and only happen once..."
-        now = current_state()
-        with open('data/current_state_object.pickle', 'wb') as handle:
-            pickle.dump(now, handle, protocol=pickle.HIGHEST_PROTOCOL)
-    return now
+    # Season tables are read from data/season_store as they are needed and the object itself is self-updating,
+    # so nothing has to be pickled between uses. A new season simply gets a new directory in the store.
+    return current_state(store=season_store(), lazy=True)
 
 def predict_series():
     now = updater()
@@ -39,6 +25,14 @@ def simulate_playoffs_from_this_point():
     now = updater()
     now.simulate_playoffs_from_this_point()
 
+def simulate_brackets():
+    now = updater()
+    now.print_bracket_simulations(num_trials=args.trials, seed=args.seed, num_workers=args.workers)
+
+def get_seeding_scenario_probs():
+    now = updater()
+    now.print_seeding_scenario_probs(num_scenarios=args.scenarios, seed=args.seed)
+
 def get_probs_of_each_round():
     now = updater()
     now.get_probs_of_each_round()
@@ -51,28 +45,44 @@ def predict_matchup():
     print('\n')
     now.predict_matchup(home_team_abb, away_team_abb, games_ahead_of_today = days_from_today / 2, for_simulation=False)
 
-parser = argparse.ArgumentParser(description='Run NBA playoff prediction functions')
-
-# Add arguments for each function
-parser.add_argument('--predict_series', action='store_true', help='Predict the winner of a playoff series')
-parser.add_argument('--simulate_playoffs_from_this_point', action='store_true', help='Simulate the playoffs from a certain point')
-parser.add_argument('--get_probs_of_each_round', action='store_true', help='Get the probability of each team making it to each round')
-parser.add_argument('--predict_matchup', action='store_true', help='Predict the winner of a playoff matchup')
-parser.add_argument('--model_retrain', action='store_true', help='Retrain stored model.')
-
-args = parser.parse_args()
-
-if args.predict_series:
-    predict_series()
-    
-if args.simulate_playoffs_from_this_point:
-    simulate_playoffs_from_this_point()
-    
-if args.get_probs_of_each_round:
-    get_probs_of_each_round()
-    
-if args.predict_matchup:
-    predict_matchup()
-
-if args.model_retrain:
-    model_retrain()
\ No newline at end of file
+# worker processes of --simulate_brackets may import this module again
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run NBA playoff prediction functions')
+
+    # Add arguments for each function
+    parser.add_argument('--predict_series', action='store_true', help='Predict the winner of a playoff series')
+    parser.add_argument('--simulate_playoffs_from_this_point', action='store_true', help='Simulate the playoffs from a certain point')
+    parser.add_argument('--get_probs_of_each_round', action='store_true', help='Get the probability of each team making it to each round')
+    parser.add_argument('--predict_matchup', action='store_true', help='Predict the winner of a playoff matchup')
+    parser.add_argument('--model_retrain', action='store_true', help='Retrain stored model.')
+    parser.add_argument('--simulate_brackets', action='store_true', help='Simulate many playoff brackets and get how often each team wins each round')
+    parser.add_argument('--trials', type=int, default=100000, help='Number of brackets for --simulate_brackets.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of processes for --simulate_brackets.')
+    parser.add_argument('--get_seeding_scenario_probs', action='store_true', help='Get round probabilities over many sampled seedings of the playoffs')
+    parser.add_argument('--scenarios', type=int, default=5000, help='Number of seedings for --get_seeding_scenario_probs.')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for --simulate_brackets and --get_seeding_scenario_probs.')
+    parser.add_argument('--transport', choices=TRANSPORT_MODES, default=None, help='Go to the network (live), also save every response (record) or answer only from saved responses (replay).')
+
+    args = parser.parse_args()
+    nba_transport.set_mode(args.transport)
+
+    if args.predict_series:
+        predict_series()
+
+    if args.simulate_playoffs_from_this_point:
+        simulate_playoffs_from_this_point()
+
+    if args.simulate_brackets:
+        simulate_brackets()
+
+    if args.get_seeding_scenario_probs:
+        get_seeding_scenario_probs()
+
+    if args.get_probs_of_each_round:
+        get_probs_of_each_round()
+
+    if args.predict_matchup:
+        predict_matchup()
+
+    if args.model_retrain:
+        model_retrain()
\ No newline at end of file
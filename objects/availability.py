@@ -0,0 +1,56 @@
+"""Playoff availability matrix."""
+import numpy as np
+import pandas as pd
+
+
+class playoff_availability:
+    """Record which roster players played in each playoff game.
+
+    played is a boolean (game x player) matrix. Player columns are grouped
+    by team, so the roster of one team is a contiguous slice of columns.
+    """
+
+    def __init__(self, team_players, played_boxes):
+        """Initialize from team -> roster player ids and playoff box rows."""
+        self.team_ids = list(team_players.keys())
+        self.team_columns = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        sizes = [len(players) for players in team_players.values()]
+        starts = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        self.team_slices = {
+            team_id: slice(starts[i], starts[i + 1])
+            for i, team_id in enumerate(self.team_ids)
+        }
+        self.player_ids = (
+            np.concatenate([np.asarray(players) for players in team_players.values()])
+            if len(sizes) > 0
+            else np.array([], dtype=np.int64)
+        )
+        columns = pd.MultiIndex.from_arrays(
+            [np.repeat(self.team_ids, sizes), self.player_ids]
+        )
+        self.game_ids = np.sort(played_boxes.GAME_ID.unique())
+        self.game_rows = {game_id: row for row, game_id in enumerate(self.game_ids)}
+        rows = np.searchsorted(self.game_ids, played_boxes.GAME_ID.to_numpy())
+        cols = columns.get_indexer(
+            pd.MultiIndex.from_arrays(
+                [played_boxes.TEAM_ID.to_numpy(), played_boxes.PLAYER_ID.to_numpy()]
+            )
+        )
+        self.played = np.zeros((len(self.game_ids), len(self.player_ids)), dtype=bool)
+        on_roster = cols >= 0
+        self.played[rows[on_roster], cols[on_roster]] = True
+        team_cols = pd.Index(self.team_ids).get_indexer(played_boxes.TEAM_ID)
+        self.team_played = np.zeros((len(self.game_ids), len(self.team_ids)), dtype=bool)
+        self.team_played[rows[team_cols >= 0], team_cols[team_cols >= 0]] = True
+
+    def sat_out(self, team_id, game_id):
+        """Get roster players of a team that did not play in one of its games."""
+        row = self.game_rows.get(game_id)
+        if (
+            (team_id not in self.team_columns)
+            or (row is None)
+            or (not self.team_played[row, self.team_columns[team_id]])
+        ):
+            raise KeyError(f"Team {team_id} did not play in game {game_id}.")
+        team_slice = self.team_slices[team_id]
+        return self.player_ids[team_slice][~self.played[row, team_slice]]
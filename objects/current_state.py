@@ -3,23 +3,37 @@
 import datetime
 import pickle
 from objects.year import year
-from objects.helper import team_abb_to_id, scrape_current_nba_injuries, scrape_nba_playoff_projections, team_id_to_abb_conv
+from objects.helper import team_abb_to_id, scrape_current_nba_injuries, fetch_nba_schedule, team_id_to_abb_conv, team_id_to_abb, team_conferences
+from objects.series import series_outcome_probabilities, possible_series_lengths, HIGHER_SEED_HOME_GAMES
+from objects.simulator import bracket_simulator, bracket_propagation, series_win_matrix, ROUNDS
+from objects.seeding import seeding_sampler, SEED_LABELS
+from objects.season_simulator import season_simulator
 import numpy as np
-import itertools
 import pandas as pd
 from random import choices
 
 class current_state:
     """Define current state class."""
 
-    def __init__(self):
-        """Initialize."""
+    def __init__(self, store=None, lazy=False):
+        """Initialize.
+
+        Pass a season_store to keep this season's tables on disk between uses,
+        and lazy=True to only load the tables a prediction actually needs.
+        """
         if datetime.datetime.now().month <= 8:
             self.year = datetime.datetime.now().year - 1
         else:
             self.year = datetime.datetime.now().year
         self.created_on = datetime.datetime.now()
         self.year_class = {}
+        self.store = store
+        self.lazy = lazy
+        self.win_prob_cache = dict()
+        self.seeding_scenario_cache = dict()
+        self.update_timestamp_win_prob = datetime.datetime.now()
+        self.playoff_picture_cache = dict()
+        self.update_timestamp_playoff_picture = datetime.datetime.now()
         with open("data/best_playoff_model.pickle", "rb") as handle:
             self.model = pickle.load(handle)
         loader_year_class = self.get_current_year_class
@@ -69,27 +83,13 @@ class current_state:
         return injured_players
 
     def get_current_max_playoff_seed_probs(self):
-        """Get teams with max probability of each seed in tourney."""
-        # Note for future: THIS NEEDS TO BE FIXED TO SIMULATE REMAINDER OF SEASON AS RIGHT NOW IT JUST TAKES MAX LIKELY SEEDS
-        seeds = self.get_playoff_picture_liklihood()
+        """Get the most likely consistent seeding of the tourney."""
+        seed_probs = self.get_playoff_picture_liklihood()
+        sampler = seeding_sampler(seed_probs)
         ret = dict()
-        already_taken = []
-        for team_abb, seed_dict in seeds.items():
-            team_seeds = []
-            team_probs = []
-            for seed, prob in seed_dict.items():
-                team_seeds.append(seed)
-                team_probs.append(prob)
-            taken_indecies = [i for i, x in enumerate(team_seeds.copy()) if x in already_taken]
-            team_seeds = [team_seeds[i] for i in range(len(team_seeds)) if i not in taken_indecies]
-            team_probs = [team_probs[i] for i in range(len(team_probs)) if i not in taken_indecies]
-            if len(team_probs) == 0:
-                continue
-            seed_choice = team_seeds[team_probs.index(max(team_probs))]
-            with_prob = seed_dict[seed_choice]
-            seed_choice = seed_choice.replace("_SEED", "")
-            already_taken.append(seed_choice)
-            ret.update({seed_choice: {team_abb: with_prob}})
+        for seed, team in zip(SEED_LABELS, sampler.most_likely_seeding()):
+            team_abb = sampler.team_abbs[team]
+            ret.update({seed: {team_abb: seed_probs[team_abb][seed]}})
         return ret
 
     def get_base_seeds(self):
@@ -174,61 +174,208 @@ class current_state:
                 break
         return current_round_state
 
-    def get_playoff_picture_liklihood(self):
-        """Get all probabilities of seeds for tourney."""
-        playoff_proj = scrape_nba_playoff_projections()
-        west = playoff_proj["West"]
-        east = playoff_proj["East"]
-        seed_columns = [
-            "1_SEED_PROB",
-            "2_SEED_PROB",
-            "3_SEED_PROB",
-            "4_SEED_PROB",
-            "5_SEED_PROB",
-            "6_SEED_PROB",
-            "7_SEED_PROB",
-            "8_SEED_PROB",
-        ]
-        west[seed_columns] = west[seed_columns].applymap(float).iloc[:8,]
-        east[seed_columns] = east[seed_columns].applymap(float).iloc[:8,]
+    def get_playoff_picture_liklihood(self, num_seasons=10000, seed=None, use_model=True):
+        """Get all probabilities of seeds for tourney (in percent).
+
+        Simulates num_seasons finishes of the regular season from the
+        remaining schedule, scoring each game with the model (or with home
+        and road win percentages), followed by the play-in. Once the regular
+        season is over the official standings are used instead, so seeds only
+        depend on the play-in. Play-in games already played keep their result.
+        Cached for an hour.
+        """
+        if datetime.datetime.now() - self.update_timestamp_playoff_picture > datetime.timedelta(
+            seconds=3600
+        ):
+            self.playoff_picture_cache = dict()
+            self.update_timestamp_playoff_picture = datetime.datetime.now()
+        cache_key = (num_seasons, seed, use_model)
+        if cache_key in self.playoff_picture_cache:
+            return self.playoff_picture_cache[cache_key]
+        this_year = self.get_current_year_class.get("current")
+        game_data = this_year.game_data
+        schedule = fetch_nba_schedule().query(
+            "SEASON_TYPE == 'play_in' | ~GAME_ID.isin(@game_data.GAME_ID)"
+        )
+        # finished games game_data does not have yet count with the schedule's result
+        played = pd.concat(
+            [
+                game_data[["GAME_ID", "TEAM_ID_H", "TEAM_ID_A", "OUTCOME"]],
+                schedule.query("SEASON_TYPE == 'regular' & GAME_STATUS == 3")[
+                    ["GAME_ID", "TEAM_ID_H", "TEAM_ID_A", "OUTCOME"]
+                ],
+            ]
+        )
+        remaining = schedule.query("SEASON_TYPE == 'regular' & GAME_STATUS != 3")
+        team_ids = team_id_to_abb.TEAM_ID.tolist()
+        if use_model:
+            all_abbs = team_id_to_abb.TEAM_ABB.tolist()
+            home_win_probs = (
+                self.get_win_probability_matrix(games_ahead_of_today=(0,))[0]
+                .loc[all_abbs, all_abbs]
+                .to_numpy()
+            )
+        else:
+            home_win_probs = self.get_record_win_probability_matrix(team_ids)
+        ranks = None
+        if (len(remaining) == 0) or (this_year.playoff_game_data.shape[0] > 0):
+            ranks = this_year.get_playoff_ranks().reindex(team_ids).to_numpy()
+        play_in_probs = home_win_probs.copy()
+        team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+        for game in schedule.query(
+            "SEASON_TYPE == 'play_in' & GAME_STATUS == 3"
+        ).itertuples():
+            home, away = team_index[game.TEAM_ID_H], team_index[game.TEAM_ID_A]
+            play_in_probs[home, away] = game.OUTCOME
+            play_in_probs[away, home] = 1 - game.OUTCOME
+        simulator = season_simulator(
+            team_ids,
+            team_conferences.loc[team_ids].to_numpy(),
+            played,
+            remaining,
+            home_win_probs,
+        )
+        seed_probs = (
+            simulator.simulate(
+                num_seasons=num_seasons,
+                seed=seed,
+                play_in_probs=play_in_probs,
+                ranks=ranks,
+            )
+            / num_seasons
+            * 100
+        )
         possible_seeds_dict = dict()
-        for index, row in east.iterrows():
-            team_id = team_id_to_abb_conv(row.TEAM_ID)
-            possible_seeds_dict.update({team_id: dict()})
-            for seed in range(1, 9):
-                possible_seeds_dict[team_id].update(
-                    {f"{seed}_EAST": row[f"{seed}_SEED_PROB"]}
-                )
-        for index, row in west.iterrows():
-            team_id = team_id_to_abb_conv(row.TEAM_ID)
-            possible_seeds_dict.update({team_id: dict()})
-            for seed in range(1, 9):
-                possible_seeds_dict[team_id].update(
-                    {f"{seed}_WEST": row[f"{seed}_SEED_PROB"]}
+        for conference in ["EAST", "WEST"]:
+            for team_id in team_conferences.index[team_conferences == conference]:
+                possible_seeds_dict.update(
+                    {
+                        team_id_to_abb_conv(team_id): {
+                            f"{seed}_{conference}": seed_probs.at[team_id, f"{seed}_SEED"]
+                            for seed in range(1, 9)
+                        }
+                    }
                 )
+        self.playoff_picture_cache[cache_key] = possible_seeds_dict
         return possible_seeds_dict
 
+    def get_record_win_probability_matrix(self, team_ids):
+        """Get (home x away) win probabilities from home and road win percentages.
+
+        Combines the home team's home win percentage with the away team's
+        road win percentage (log5); teams without games count as .500.
+        """
+        standings = self.get_current_year_class.get("current").standings.reindex(
+            team_ids
+        )
+        home = standings.HOME_WIN_PCT.fillna(0.5).to_numpy()[:, None]
+        road = standings.ROAD_WIN_PCT.fillna(0.5).to_numpy()[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            home_win_probs = home * (1 - road) / (home * (1 - road) + (1 - home) * road)
+        return np.nan_to_num(home_win_probs, nan=0.5)
+
     @property
     def get_current_year_class(self):
         """Get current year."""
         if len(self.year_class.keys()) == 0:
-            self.year_class.update({"current": year(self.year)})
+            self.year_class.update({"current": year(self.year, store=self.store, lazy=self.lazy)})
         return self.year_class
 
+    def get_win_probability_matrix(self, games_ahead_of_today=(0,), team_abbs=None):
+        """Get home win probabilities for every (home, away) pair of teams.
+
+        Returns a dict keyed by games_ahead_of_today holding a 30x30 frame
+        indexed by home team abbreviation with away team abbreviations as
+        columns. Only pairs among team_abbs (all teams by default) that are not
+        cached yet get scored, and they are scored in one predict_proba call.
+        """
+        if datetime.datetime.now() - self.update_timestamp_win_prob > datetime.timedelta(
+            seconds=3600
+        ):
+            self.win_prob_cache = dict()
+            self.seeding_scenario_cache = dict()
+            self.update_timestamp_win_prob = datetime.datetime.now()
+        all_abbs = team_id_to_abb.TEAM_ABB.tolist()
+        if team_abbs is None:
+            team_abbs = all_abbs
+        to_score = []
+        for games_ahead in games_ahead_of_today:
+            if games_ahead not in self.win_prob_cache:
+                self.win_prob_cache[games_ahead] = pd.DataFrame(
+                    np.nan, index=all_abbs, columns=all_abbs
+                )
+            matrix = self.win_prob_cache[games_ahead]
+            to_score.extend(
+                (home_abb, away_abb, games_ahead)
+                for home_abb in team_abbs
+                for away_abb in team_abbs
+                if (home_abb != away_abb) and np.isnan(matrix.at[home_abb, away_abb])
+            )
+        if len(to_score) > 0:
+            features = self.get_current_year_class.get(
+                "current"
+            ).get_features_for_upcoming_matchups(
+                matchups=[
+                    (team_abb_to_id(home_abb), team_abb_to_id(away_abb), games_ahead)
+                    for home_abb, away_abb, games_ahead in to_score
+                ],
+                injury_adjusted=self.model.injury_adjusted,
+                avg_minutes_played_cutoff=self.model.avg_minutes_played_cutoff,
+            )
+            probs = self.model.model.predict_proba(features)[:, 1]
+            for (home_abb, away_abb, games_ahead), prob in zip(to_score, probs):
+                self.win_prob_cache[games_ahead].at[home_abb, away_abb] = prob
+        return {
+            games_ahead: self.win_prob_cache[games_ahead]
+            for games_ahead in games_ahead_of_today
+        }
+
     def predict_matchup(self, home_abb, away_abb, games_ahead_of_today=0, for_simulation=True):
         """Predicts upcoming matchup."""
-        home_id, away_id = team_abb_to_id(home_abb), team_abb_to_id(away_abb)
-        features = self.year_class.get("current").get_features_for_upcoming(
-            home_team=home_id,
-            away_team=away_id,
-            injury_adjusted=self.model.injury_adjusted,
-            avg_minutes_played_cutoff=self.model.avg_minutes_played_cutoff,
-            games_ahead_of_today=games_ahead_of_today,
-        )
-        prob = self.model.model.predict_proba(features)
+        prob = self.get_win_probability_matrix(
+            games_ahead_of_today=[games_ahead_of_today], team_abbs=[home_abb, away_abb]
+        )[games_ahead_of_today].at[home_abb, away_abb]
         if not for_simulation:
-            print(f"{home_abb} has a {round(prob[0][1] * 100, 2)} chance of beating {away_abb} at home.")
-        return prob[0][1]  # Return home win probabilities
+            print(f"{home_abb} has a {round(prob * 100, 2)} chance of beating {away_abb} at home.")
+        return float(prob)  # Return home win probabilities
+
+    def get_series_game_probabilities(
+        self, higher_seed_abb, lower_seed_abb, series_starts_in_how_many_games=0
+    ):
+        """Get the higher seed's win probability for each of the 7 games of a series."""
+        horizons = [series_starts_in_how_many_games + game for game in range(7)]
+        matrices = self.get_win_probability_matrix(
+            games_ahead_of_today=horizons, team_abbs=[higher_seed_abb, lower_seed_abb]
+        )
+        return np.array(
+            [
+                matrices[games_ahead].at[higher_seed_abb, lower_seed_abb]
+                if higher_home
+                else 1 - matrices[games_ahead].at[lower_seed_abb, higher_seed_abb]
+                for games_ahead, higher_home in zip(horizons, HIGHER_SEED_HOME_GAMES)
+            ]
+        )
+
+    def get_series_probability_matrix(
+        self, team_abbs, series_starts_in_how_many_games=0
+    ):
+        """Get the game probabilities of every possible series among team_abbs.
+
+        Entry [game, i, j] is the probability that team_abbs[i] wins game
+        game + 1 of a series where it is the higher seed against team_abbs[j],
+        so games the lower seed hosts use one minus its home win probability.
+        """
+        horizons = [series_starts_in_how_many_games + game for game in range(7)]
+        matrices = self.get_win_probability_matrix(
+            games_ahead_of_today=horizons, team_abbs=team_abbs
+        )
+        series_probs = np.empty((7, len(team_abbs), len(team_abbs)))
+        for game, (games_ahead, higher_home) in enumerate(
+            zip(horizons, HIGHER_SEED_HOME_GAMES)
+        ):
+            matrix = matrices[games_ahead].loc[team_abbs, team_abbs].to_numpy()
+            series_probs[game] = matrix if higher_home else 1 - matrix.T
+        return series_probs
 
     def predict_series(
         self,
@@ -256,40 +403,10 @@ class current_state:
                     )
             num_games = higher_already_won + lower_already_won
             return {lower_seed_abb: {num_games: 1}}
-        prob_game_1 = self.predict_matchup(
-            home_abb=higher_seed_abb,
-            away_abb=lower_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games,
-        )
-        prob_game_2 = self.predict_matchup(
-            home_abb=higher_seed_abb,
-            away_abb=lower_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 1,
-        )
-        prob_game_3 = self.predict_matchup(
-            home_abb=lower_seed_abb,
-            away_abb=higher_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 2,
-        )
-        prob_game_4 = self.predict_matchup(
-            home_abb=lower_seed_abb,
-            away_abb=higher_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 3,
-        )
-        prob_game_5 = self.predict_matchup(
-            home_abb=higher_seed_abb,
-            away_abb=lower_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 4,
-        )
-        prob_game_6 = self.predict_matchup(
-            home_abb=lower_seed_abb,
-            away_abb=higher_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 5,
-        )
-        prob_game_7 = self.predict_matchup(
-            home_abb=higher_seed_abb,
-            away_abb=lower_seed_abb,
-            games_ahead_of_today=series_starts_in_how_many_games + 6,
+        prob_higher_wins_each_game = self.get_series_game_probabilities(
+            higher_seed_abb,
+            lower_seed_abb,
+            series_starts_in_how_many_games=series_starts_in_how_many_games,
         )
         if not for_simulation:
             higher_id, lower_id = team_abb_to_id(higher_seed_abb), team_abb_to_id(
@@ -324,81 +441,25 @@ class current_state:
             print(
                 f"{higher_seed_abb}-{lower_seed_abb} series is currently {higher_already_won}-{lower_already_won} \n"
             )
-        prob_higher_wins_each_game = (
-            prob_game_1,
-            prob_game_2,
-            prob_game_3,
-            prob_game_4,
-            prob_game_5,
-            prob_game_6,
-            prob_game_7,
-        )
-        num_already_played = higher_already_won + lower_already_won
-        already_occured = np.append(
-            np.repeat(0, lower_already_won), np.repeat(1, higher_already_won)
+        higher_wins_in, lower_wins_in = series_outcome_probabilities(
+            prob_higher_wins_each_game,
+            higher_already_won=higher_already_won,
+            lower_already_won=lower_already_won,
         )
-        prob_higher_wins_each_game = np.append(
-            already_occured, prob_higher_wins_each_game[num_already_played:]
+        higher_lengths, lower_lengths = possible_series_lengths(
+            higher_already_won, lower_already_won
         )
-        if num_already_played < 4:
-            games_left_to_play = list(range(4, 8))
-        else:
-            games_left_to_play = list(range(num_already_played + 1, 8))
-        # Get possible sample space
-        sample_space_previously_over = []
-        for game in games_left_to_play:
-            sample_space_new = list(
-                itertools.product([0, 1], repeat=game - num_already_played)
-            )
-            sample_space = [
-                tuple(np.append(already_occured, outcome))
-                for outcome in sample_space_new
-            ]
-            sample_space_without_previously_over = [
-                outcome
-                for outcome in sample_space
-                if (outcome[: game - 1] not in sample_space_previously_over)
-            ]
-            ended_this_round = [
-                outcome
-                for outcome in sample_space_without_previously_over
-                if ((outcome.count(1) == 4) and (outcome[-1] == 1))
-                or ((outcome.count(0) == 4) and (outcome[-1] == 0))
-            ]
-            sample_space_previously_over.extend(ended_this_round)
-        outcomes = {higher_seed_abb: dict(), lower_seed_abb: dict()}
-        for outcome in sample_space_previously_over:
-            num_games = len(outcome)
-            higher_win_prob_list = prob_higher_wins_each_game[:num_games]
-            prob_of_what_occured = np.product(
-                list(
-                    map(
-                        lambda x, y: 1 - y if x == 0 else y,
-                        outcome,
-                        higher_win_prob_list,
-                    )
-                ),
-                dtype=np.float64,
-            )
-            if outcome.count(1) == 4:
-                if num_games in outcomes[higher_seed_abb].keys():
-                    outcomes[higher_seed_abb][num_games].append(prob_of_what_occured)
-                else:
-                    outcomes[higher_seed_abb].update(
-                        {num_games: [prob_of_what_occured]}
-                    )
-            elif outcome.count(0) == 4:
-                if num_games in outcomes[lower_seed_abb].keys():
-                    outcomes[lower_seed_abb][num_games].append(prob_of_what_occured)
-                else:
-                    outcomes[lower_seed_abb].update({num_games: [prob_of_what_occured]})
-            else:
-                raise KeyError("Proper number of wins was not obtained for either team")
+        outcomes = {
+            higher_seed_abb: {
+                num_games: higher_wins_in[num_games - 4] for num_games in higher_lengths
+            },
+            lower_seed_abb: {
+                num_games: lower_wins_in[num_games - 4] for num_games in lower_lengths
+            },
+        }
         total_prob_higher, total_prob_lower = 0, 0
         for team_abb, value in outcomes.items():
-            for inner_key, inner_value in value.items():
-                prob = np.sum(inner_value)
-                outcomes[team_abb][inner_key] = prob
+            for inner_key, prob in value.items():
                 if not for_simulation:
                     print(
                         f"        {team_abb} wins in {inner_key}: {round(prob*100, 2)}%"
@@ -431,6 +492,9 @@ class current_state:
         current_round_num = max([int(key[1]) for key in current_state.keys()])
         base_seeds = self.get_base_seeds()
         seeds = base_seeds.copy()
+        self.get_win_probability_matrix(
+            games_ahead_of_today=range(7), team_abbs=base_seeds.TEAM_ABB.tolist()
+        )
         curr_year = self.year_class.get("current")
         rounds_to_play = list(range(1, 5))
         games_from_now = 0
@@ -570,114 +634,128 @@ class current_state:
             else:
                 games_from_now += 7
 
+    def get_bracket_inputs(self):
+        """Get seeds, series probabilities, records and state of the bracket."""
+        base_seeds = self.get_base_seeds()
+        tourney_state = self.get_current_tourney_state()
+        team_abbs = base_seeds.TEAM_ABB.tolist()
+        records = (
+            self.get_current_year_class.get("current")
+            .standings.set_index("TEAM_ABBREVIATION")
+            .WIN_PCT.reindex(team_abbs)
+        )
+        return (
+            dict(zip(base_seeds.SEED, team_abbs)),
+            self.get_series_probability_matrix(team_abbs),
+            records.to_numpy(),
+            tourney_state,
+        )
+
+    def simulate_brackets(self, num_trials=100000, seed=None, num_workers=1):
+        """Simulate num_trials brackets at once from the current tourney state.
+
+        Returns trial counts of how often each team won each round and won or
+        lost each round's series in 4-7 games (see bracket_simulator). With
+        more than one worker the trials are split across processes.
+        """
+        simulator = bracket_simulator(self.script, *self.get_bracket_inputs())
+        if num_workers == 1:
+            return simulator.simulate(num_trials=num_trials, seed=seed)
+        return simulator.simulate_parallel(
+            num_trials=num_trials, seed=seed, num_workers=num_workers
+        )
+
+    def print_bracket_simulations(self, num_trials=100000, seed=None, num_workers=1):
+        """Print how often each team won each round over many simulated brackets."""
+        print(f"Simulating {num_trials} {self.year} NBA-playoff brackets")
+        results = self.simulate_brackets(
+            num_trials=num_trials, seed=seed, num_workers=num_workers
+        )
+        round_reach = (results["round_reach"] / results["trials"]).sort_values(
+            ["R4", "R3", "R2", "R1"], ascending=False
+        )
+        round_reach.columns = ["ROUND 1", "ROUND 2", "ROUND 3", "NBA FINALS"]
+        print((round_reach * 100).round(2).to_string())
+
+    def get_seeding_scenario_probs(self, num_scenarios=5000, seed=None):
+        """Get round probabilities over sampled seeding scenarios.
+
+        Draws num_scenarios seedings from the playoff picture and weighs the
+        exact bracket of each distinct one by how often it was drawn. Brackets
+        are cached per seeding, and every pair of teams is scored once, so
+        repeated scenarios and calls cost no model or feature work.
+        """
+        sampler = seeding_sampler(self.get_playoff_picture_liklihood())
+        team_abbs = sampler.team_abbs
+        series_probs = self.get_series_probability_matrix(team_abbs)
+        records = (
+            self.get_current_year_class.get("current")
+            .standings.set_index("TEAM_ABBREVIATION")
+            .WIN_PCT.reindex(team_abbs)
+            .to_numpy()
+        )
+        series_win = series_win_matrix(series_probs)
+        scenarios, weights = sampler.scenarios(num_scenarios=num_scenarios, seed=seed)
+        round_reach = np.zeros((len(team_abbs), len(ROUNDS)))
+        for scenario, weight in zip(scenarios, weights):
+            scenario_key = tuple(team_abbs[team] for team in scenario)
+            if scenario_key not in self.seeding_scenario_cache:
+                self.seeding_scenario_cache[scenario_key] = (
+                    bracket_propagation(
+                        self.script,
+                        dict(zip(SEED_LABELS, scenario_key)),
+                        series_probs[:, scenario][:, :, scenario],
+                        records[scenario],
+                        series_win=series_win[scenario][:, scenario],
+                    )
+                    .propagate()["round_reach"]
+                    .to_numpy()
+                )
+            round_reach[scenario] += weight * self.seeding_scenario_cache[scenario_key]
+        return pd.DataFrame(round_reach, index=team_abbs, columns=ROUNDS)
+
+    def print_seeding_scenario_probs(self, num_scenarios=5000, seed=None):
+        """Print round probabilities over sampled seeding scenarios."""
+        print(f"Weighing {num_scenarios} seeding scenarios of the {self.year} NBA-playoffs")
+        round_reach = self.get_seeding_scenario_probs(
+            num_scenarios=num_scenarios, seed=seed
+        ).sort_values(["R4", "R3", "R2", "R1"], ascending=False)
+        round_reach = round_reach[round_reach.R1 > 0]
+        round_reach.columns = ["ROUND 1", "ROUND 2", "ROUND 3", "NBA FINALS"]
+        print((round_reach * 100).round(2).to_string())
+
     def get_probs_of_each_round(self):
         """Get round probabilities."""
-        base_seeds = self.get_base_seeds()
-        current_state = self.get_current_tourney_state()
-        prob_of_seed = {row.SEED: {row.TEAM_ABB: 1} for _, row in base_seeds.iterrows()}
-        for this_round, matchups in self.script.items():
+        propagation = bracket_propagation(self.script, *self.get_bracket_inputs())
+        bracket = propagation.propagate()
+        team_abbs = propagation.team_abbs
+        for this_round in self.script.keys():
             print(f"Loading {this_round} win probabilities...")
-            if this_round not in current_state.keys():
-                current_state.update({this_round: dict()})
-            for matchup in matchups:
-                seed_reward = "_".join(matchup)
-                if this_round == "R4":
-                    year_class = self.get_current_year_class.get("current")
-                    team_1_record = year_class.get_team_record(matchup[0])
-                    team_2_record = year_class.get_team_record(matchup[1])
-                    if team_1_record > team_2_record:
-                        higher_seed_probs = prob_of_seed[matchup[0]]
-                        lower_seed_probs = prob_of_seed[matchup[1]]
-                    else:
-                        higher_seed_probs = prob_of_seed[matchup[1]]
-                        lower_seed_probs = prob_of_seed[matchup[0]]
+            for _, higher, lower, higher_won, lower_won in bracket["series"][this_round]:
+                higher_seed, lower_seed = team_abbs[higher], team_abbs[lower]
+                if (higher_won == 4) or (lower_won == 4):
+                    print(
+                        f"{higher_seed}-{lower_seed} series was completed {higher_won}-{lower_won}"
+                    )
                 else:
-                    higher_seed_probs = prob_of_seed[matchup[0]]
-                    lower_seed_probs = prob_of_seed[matchup[1]]
-                prob_of_matchups_dict = {
-                    f"{higher_seed_abb}_{lower_seed_abb}": higher_seed_probs[
-                        higher_seed_abb
-                    ]
-                    * lower_seed_probs[lower_seed_abb]
-                    for higher_seed_abb in higher_seed_probs
-                    for lower_seed_abb in lower_seed_probs
-                }
-                prob_of_seed.update({seed_reward: dict()})
-                for possible_matchup, prob_of_matchup in prob_of_matchups_dict.items():
-                    higher_seed, lower_seed = possible_matchup[:3], possible_matchup[4:]
-                    if prob_of_matchup == 0:
-                        continue
-                    if seed_reward in current_state[this_round].keys():
-                        current_state_of_matchup = current_state[this_round][
-                            seed_reward
-                        ]
-                        higher_seed_won = current_state_of_matchup[higher_seed]
-                        lower_seed_won = current_state_of_matchup[lower_seed]
-                        if (higher_seed_won == 4) or (lower_seed_won == 4):
-                            print(
-                                f"{higher_seed}-{lower_seed} series was completed {higher_seed_won}-{lower_seed_won}"
-                            )
-                        else:
-                            print(
-                                f"{higher_seed}-{lower_seed} is currently in progress {higher_seed_won}-{lower_seed_won}"
-                            )
-                    else:
-                        higher_seed_won, lower_seed_won = 0, 0
-                    predict_series_dict = self.predict_series(
-                        higher_seed,
-                        lower_seed,
-                        higher_already_won=higher_seed_won,
-                        lower_already_won=lower_seed_won,
-                        for_simulation=True,
+                    print(
+                        f"{higher_seed}-{lower_seed} is currently in progress {higher_won}-{lower_won}"
                     )
-                    if higher_seed not in predict_series_dict.keys():
-                        prob_higher_seed_wins = 0
-                    else:
-                        prob_higher_seed_wins = np.sum(
-                            list(predict_series_dict[higher_seed].values())
-                        )
-                    if higher_seed in prob_of_seed[seed_reward]:
-                        prob_of_seed[seed_reward][higher_seed] += (
-                            prob_higher_seed_wins * prob_of_matchup
-                        )
-                    else:
-                        prob_of_seed[seed_reward].update(
-                            {higher_seed: prob_higher_seed_wins * prob_of_matchup}
-                        )
-                    if lower_seed in prob_of_seed[seed_reward]:
-                        prob_of_seed[seed_reward][lower_seed] += (
-                            1 - prob_higher_seed_wins
-                        ) * prob_of_matchup
-                    else:
-                        prob_of_seed[seed_reward].update(
-                            {lower_seed: (1 - prob_higher_seed_wins) * prob_of_matchup}
-                        )
+            round_probabilities = bracket["round_reach"][this_round]
             if this_round == "R4":
-                round_probabilities = [
-                    (team_abb, prob_of_seed[seed_reward][team_abb])
-                    for team_abb in prob_of_seed[seed_reward]
+                # only teams that can still make the finals are listed
+                round_probabilities = round_probabilities[
+                    bracket["round_reach"]["R3"] > 0
                 ]
-                round_probabilities.sort(key=lambda x: x[1], reverse=True)
+            round_probabilities = sorted(
+                round_probabilities.items(), key=lambda item: -item[1]
+            )
+            if this_round == "R4":
                 print(f"_______NBA FINALS________")
-                for team_prob in round_probabilities:
-                    print(f"{team_prob[0]} wins: {round(team_prob[1] * 100, 2)}%")
+                for team_abb, prob in round_probabilities:
+                    print(f"{team_abb} wins: {round(prob * 100, 2)}%")
                 return
-            winning_seeds_this_round = list(
-                itertools.chain(*self.script[f"R{int(this_round[1]) + 1}"])
-            )
             print(f"_______ROUND {this_round[1]}________")
-            prob_of_round_dict = {}
-            for team_abb in base_seeds.TEAM_ABB:
-                total_prob = 0
-                for winning_seed in winning_seeds_this_round:
-                    try:
-                        total_prob += prob_of_seed[winning_seed][team_abb]
-                    except KeyError:
-                        total_prob += 0
-                prob_of_round_dict.update({team_abb: total_prob})
-            round_probabilities = dict(
-                sorted(prob_of_round_dict.items(), key=lambda item: -item[1])
-            )
-            for team_abb, prob in round_probabilities.items():
+            for team_abb, prob in round_probabilities:
                 print(f"{team_abb} wins: {round(prob * 100, 2)}%")
             print("\n \n \n")
@@ -0,0 +1,72 @@
+"""On disk feature store."""
+import hashlib
+import os
+import pandas as pd
+
+
+class feature_store:
+    """Store feature rows on disk in Parquet shards.
+
+    Each shard holds the rows of one season for one (injury_adjusted,
+    avg_minutes_played_cutoff, schema_version) setting and is named by a hash
+    of that key, with one row per GAME_ID.
+    """
+
+    def __init__(self, schema_version, path="data/feature_store"):
+        """Initialize."""
+        self.schema_version = schema_version
+        self.path = path
+
+    def shard_key(self, season, injury_adjusted, avg_minutes_played_cutoff):
+        """Hash the settings a shard was built with."""
+        key = (
+            f"season={season}|injury_adjusted={bool(injury_adjusted)}"
+            f"|avg_minutes_played_cutoff={float(avg_minutes_played_cutoff)}"
+            f"|schema_version={self.schema_version}"
+        )
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def shard_path(self, season, injury_adjusted, avg_minutes_played_cutoff):
+        """Get file path of a shard."""
+        return os.path.join(
+            self.path,
+            str(season),
+            self.shard_key(season, injury_adjusted, avg_minutes_played_cutoff)
+            + ".parquet",
+        )
+
+    def load(self, season, injury_adjusted, avg_minutes_played_cutoff):
+        """Load every stored row of a shard, empty if nothing is stored yet."""
+        path = self.shard_path(season, injury_adjusted, avg_minutes_played_cutoff)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=["GAME_ID"])
+        return pd.read_parquet(path)
+
+    def missing_game_ids(
+        self, season, injury_adjusted, avg_minutes_played_cutoff, game_ids
+    ):
+        """Get the game ids of game_ids that have no stored row."""
+        stored = set(
+            self.load(season, injury_adjusted, avg_minutes_played_cutoff).GAME_ID
+        )
+        return [game_id for game_id in game_ids if game_id not in stored]
+
+    def save(self, season, injury_adjusted, avg_minutes_played_cutoff, features):
+        """Add rows to a shard, replacing stored rows with the same GAME_ID."""
+        stored = self.load(season, injury_adjusted, avg_minutes_played_cutoff)
+        stored = stored[~stored.GAME_ID.isin(features.GAME_ID)]
+        if len(stored) > 0:
+            features = pd.concat([stored, features], ignore_index=True)
+        path = self.shard_path(season, injury_adjusted, avg_minutes_played_cutoff)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        features.reset_index(drop=True).to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+    def get(self, season, injury_adjusted, avg_minutes_played_cutoff, game_ids):
+        """Get stored rows for game_ids in the order given."""
+        stored = self.load(season, injury_adjusted, avg_minutes_played_cutoff)
+        return (
+            stored.set_index("GAME_ID")
+            .reindex(list(game_ids))
+            .reset_index()
+        )
@@ -0,0 +1,107 @@
+"""Model feature schema and kernel."""
+import warnings
+import numpy as np
+import pandas as pd
+
+# Player box score stats every team feature is built from, in model order
+FEATURE_STATS = [
+    "PTS",
+    "FGM",
+    "FGA",
+    "FG_PCT",
+    "FG3M",
+    "FG3A",
+    "FG3_PCT",
+    "FTM",
+    "FTA",
+    "FT_PCT",
+    "OREB",
+    "DREB",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "PF",
+]
+FEATURE_STATISTICS = ["mean", "median", "max"]
+
+
+def team_feature_columns(side):
+    """Get the feature columns of one side ("H" or "A") of a game."""
+    return [
+        f"{statistic}_{stat}_{side}"
+        for statistic in FEATURE_STATISTICS
+        for stat in FEATURE_STATS
+    ] + [f"depth_at_cutoff_{side}"]
+
+
+FEATURE_COLUMNS = (
+    team_feature_columns("H")
+    + ["home_win_percentage"]
+    + team_feature_columns("A")
+    + ["road_win_percentage"]
+)
+TEAM_WIDTH = len(FEATURE_STATISTICS) * len(FEATURE_STATS)
+HOME_STATS = slice(0, TEAM_WIDTH)
+HOME_DEPTH = TEAM_WIDTH
+HOME_WIN_PERCENTAGE = TEAM_WIDTH + 1
+AWAY_STATS = slice(TEAM_WIDTH + 2, 2 * TEAM_WIDTH + 2)
+AWAY_DEPTH = 2 * TEAM_WIDTH + 2
+ROAD_WIN_PERCENTAGE = 2 * TEAM_WIDTH + 3
+
+
+def summarize_groups(group_ids, stats, num_groups):
+    """Get mean, median and max of every stat for each group of players.
+
+    group_ids gives the group of each row of the (players x stats) array.
+    Groups are padded with NaN into one (groups x players x stats) block so
+    every statistic is a single nan-aware reduction; NaN stats are skipped
+    like pandas does. Returns (groups x TEAM_WIDTH) summaries and group sizes.
+    """
+    sizes = np.bincount(group_ids, minlength=num_groups)
+    summaries = np.full((num_groups, TEAM_WIDTH), np.nan)
+    if len(group_ids) == 0:
+        return summaries, sizes
+    order = np.argsort(group_ids, kind="stable")
+    sorted_groups = group_ids[order]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    slot = np.arange(len(order)) - starts[sorted_groups]
+    padded = np.full((num_groups, sizes.max(), stats.shape[1]), np.nan)
+    padded[sorted_groups, slot] = stats[order]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        summaries[:] = np.concatenate(
+            [
+                np.nanmean(padded, axis=1),
+                np.nanmedian(padded, axis=1),
+                np.nanmax(padded, axis=1),
+            ],
+            axis=1,
+        )
+    return summaries, sizes
+
+
+def build_feature_frame(
+    team_summaries, team_sizes, home_groups, away_groups, home_win, road_win
+):
+    """Fill the preallocated float32 feature array of a batch of games.
+
+    home_groups and away_groups give each game's row in team_summaries, or -1
+    when no player of that side made the cutoff.
+    """
+    features = np.full((len(home_groups), len(FEATURE_COLUMNS)), np.nan, np.float32)
+    for stats_slice, depth, groups in [
+        (HOME_STATS, HOME_DEPTH, home_groups),
+        (AWAY_STATS, AWAY_DEPTH, away_groups),
+    ]:
+        found = groups >= 0
+        features[found, stats_slice] = team_summaries[groups[found]]
+        features[:, depth] = 0
+        features[found, depth] = team_sizes[groups[found]]
+    features[:, HOME_WIN_PERCENTAGE] = home_win
+    features[:, ROAD_WIN_PERCENTAGE] = road_win
+    frame = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+    for depth_column in ["depth_at_cutoff_H", "depth_at_cutoff_A"]:
+        frame[depth_column] = frame[depth_column].astype(int)
+    return frame
@@ -3,22 +3,31 @@ from nba_api.stats.static import teams, players
 import pandas as pd
 import datetime
 from bs4 import BeautifulSoup
-import requests
+import pickle
+import os
+import json
+from objects.transport import nba_transport
 
 team_id_to_abb = pd.DataFrame(teams.get_teams()).rename(
     columns={"full_name": "TEAM_NAME",
              "id": "TEAM_ID", "abbreviation": "TEAM_ABB"}
 )
 nba_team_ids = team_id_to_abb.TEAM_ID
+team_ids_by_abb = team_id_to_abb.set_index("TEAM_ABB").TEAM_ID
+team_abbs_by_id = team_id_to_abb.set_index("TEAM_ID").TEAM_ABB
+EAST_TEAM_ABBS = [
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DET", "IND",
+    "MIA", "MIL", "NYK", "ORL", "PHI", "TOR", "WAS",
+]
+team_conferences = team_abbs_by_id.map(
+    lambda team_abb: "EAST" if team_abb in EAST_TEAM_ABBS else "WEST"
+)
 
 
 def team_abb_to_id(team_abb):
     """Translate team abbreviation to id."""
     try:
-        return (
-            team_id_to_abb.query(
-                "TEAM_ABB == @team_abb").reset_index(drop=1).TEAM_ID[0]
-        )
+        return team_ids_by_abb.loc[team_abb]
     except KeyError:
         raise KeyError(
             f"User has input non-valid team abbreviation: {team_abb}")
@@ -27,23 +36,19 @@ def team_abb_to_id(team_abb):
 def team_id_to_abb_conv(team_id):
     """Translate team id to abb."""
     try:
-        return (
-            team_id_to_abb.query(
-                "TEAM_ID == @team_id").reset_index(drop=1).TEAM_ABB[0]
-        )
+        return team_abbs_by_id.loc[team_id]
     except KeyError:
         raise KeyError(f"User has input non-valid team id: {team_id}")
 
 
-def scrape_current_nba_injuries(games_ahead_of_now):
-    """Scrape injuries."""
+def fetch_current_nba_injuries():
+    """Scrape the full current injury table from CBS."""
     player_ids = pd.DataFrame(
         players.get_active_players())[["id", "full_name"]].rename(
         columns={"full_name": "PLAYER_NAME", "id": "PLAYER_ID"}
     )
     url = "https://www.cbssports.com/nba/injuries/"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(nba_transport.get_text(url), "html.parser")
 
     # find the table containing injury data
     table = soup.find("div", class_="Page-colMain")
@@ -82,74 +87,103 @@ def scrape_current_nba_injuries(games_ahead_of_now):
         else datetime.datetime.now() + datetime.timedelta(days=2)
         for when_back in df.EXPECTED_WHEN_BACK
     ]
-    ret = df.merge(player_ids, on="PLAYER_NAME", how="left")
-    gametime_date = datetime.datetime.now() + datetime.timedelta(
-        days=(games_ahead_of_now * 2)
-    )  # assume two days between playoff games on average
-    return ret.query("(PLAYER_ID.notna()) & (EXPECTED_WHEN_BACK > @gametime_date)")
+    return df.merge(player_ids, on="PLAYER_NAME", how="left")
 
 
-def scrape_nba_playoff_projections():
-    """Scrape playoff projections."""
-    team_ids = pd.DataFrame(teams.get_teams())[["id", "full_name"]].rename(
-        columns={"full_name": "TEAM_NAME", "id": "TEAM_ID"}
-    )
-    url = "https://www.basketball-reference.com/friv/playoff_prob.html"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+class injury_report:
+    """Hold one scraped injury table, refreshed at most once per ttl_seconds.
 
-    # find tables
-    table_e = soup.find(
-        "div", {"class": "table_container", "id": "div_projected_standings_e"}
-    )
-    table_w = soup.find(
-        "div", {"class": "table_container", "id": "div_projected_standings_w"}
-    )
-    data = []
-    for tr in table_e.find_all("tr"):
-        row = []
-        for td in tr.find_all("td"):
-            row.append(td.text.strip())
-        data.append(row)
-    data = data = list(
-        map(
-            lambda row: [
-                row[i] if row[i] != "" else 0.0
-                for i in [0, 9, 10, 11, 12, 13, 14, 15, 16]
-            ],
-            [row for row in data if len(row) == 21],
+    The table is kept in memory and pickled to path so separate commands
+    within the ttl also skip the scrape.
+    """
+
+    def __init__(self, ttl_seconds=3600, path="data/injury_report.pickle"):
+        """Initialize."""
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.injuries_cache = pd.DataFrame()
+        self.update_timestamp = datetime.datetime.min
+
+    def is_stale(self, timestamp):
+        """Check whether a snapshot taken at timestamp has expired."""
+        return datetime.datetime.now() - timestamp > datetime.timedelta(
+            seconds=self.ttl_seconds
         )
-    )
-    headers = [
-        "TEAM_NAME",
-        "1_SEED_PROB",
-        "2_SEED_PROB",
-        "3_SEED_PROB",
-        "4_SEED_PROB",
-        "5_SEED_PROB",
-        "6_SEED_PROB",
-        "7_SEED_PROB",
-        "8_SEED_PROB",
-    ]
-    data_e = pd.DataFrame(data, columns=headers).merge(
-        team_ids, on="TEAM_NAME", how="left"
-    )
-    data = []
-    for tr in table_w.find_all("tr"):
-        row = []
-        for td in tr.find_all("td"):
-            row.append(td.text.strip())
-        data.append(row)
-    data = data = list(
-        map(
-            lambda row: [
-                row[i] if row[i] != "" else 0.0
-                for i in [0, 9, 10, 11, 12, 13, 14, 15, 16]
-            ],
-            [row for row in data if len(row) == 21],
+
+    @property
+    def injuries(self):
+        """Get the current injury table, scraping only when the snapshot expired."""
+        if not self.is_stale(self.update_timestamp):
+            return self.injuries_cache
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as handle:
+                snapshot = pickle.load(handle)
+            if not self.is_stale(snapshot["update_timestamp"]):
+                self.injuries_cache = snapshot["injuries"]
+                self.update_timestamp = snapshot["update_timestamp"]
+                return self.injuries_cache
+        self.injuries_cache = fetch_current_nba_injuries()
+        self.update_timestamp = datetime.datetime.now()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "wb") as handle:
+            pickle.dump(
+                {
+                    "update_timestamp": self.update_timestamp,
+                    "injuries": self.injuries_cache,
+                },
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        return self.injuries_cache
+
+    def out_for_game(self, games_ahead_of_now):
+        """Get players still expected to be out games_ahead_of_now games from now."""
+        gametime_date = datetime.datetime.now() + datetime.timedelta(
+            days=(games_ahead_of_now * 2)
+        )  # assume two days between playoff games on average
+        return self.injuries.query(
+            "(PLAYER_ID.notna()) & (EXPECTED_WHEN_BACK > @gametime_date)"
         )
+
+
+current_injuries = injury_report()
+
+
+def scrape_current_nba_injuries(games_ahead_of_now):
+    """Scrape injuries."""
+    return current_injuries.out_for_game(games_ahead_of_now)
+
+
+def fetch_nba_schedule():
+    """Get this season's regular season and play-in schedule from cdn.nba.com.
+
+    OUTCOME (1 for a home win) only means something for finished games,
+    which have GAME_STATUS 3.
+    """
+    url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+    game_dates = json.loads(nba_transport.get_text(url))["leagueSchedule"]["gameDates"]
+    schedule = pd.DataFrame(
+        [
+            {
+                "GAME_ID": game["gameId"],
+                "TEAM_ID_H": game["homeTeam"]["teamId"],
+                "TEAM_ID_A": game["awayTeam"]["teamId"],
+                "GAME_STATUS": game["gameStatus"],
+                "OUTCOME": int(
+                    (game["homeTeam"]["score"] or 0) > (game["awayTeam"]["score"] or 0)
+                ),
+            }
+            for game_date in game_dates
+            for game in game_date["games"]
+        ],
+        columns=["GAME_ID", "TEAM_ID_H", "TEAM_ID_A", "GAME_STATUS", "OUTCOME"],
     )
-    data_w = pd.DataFrame(data, columns=headers).merge(
-        team_ids, on="TEAM_NAME", how="left"
+    # the third digit of a game id is its season type, teams not yet known have id 0
+    schedule["SEASON_TYPE"] = schedule.GAME_ID.str[2].map(
+        {"2": "regular", "5": "play_in"}
     )
-    return {"West": data_w, "East": data_e}
+    return schedule[
+        schedule.SEASON_TYPE.notna()
+        & schedule.TEAM_ID_H.isin(nba_team_ids)
+        & schedule.TEAM_ID_A.isin(nba_team_ids)
+    ].reset_index(drop=True)
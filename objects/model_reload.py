@@ -50,11 +50,11 @@ def model_retrain():
     #         (i.e. "mean_AST_H")
     poss_inj_adj = [True, False]
     poss_avg_cut = list(range(0, 15, 5))
-    hyperparamter_space = list(itertools.product(poss_inj_adj, poss_avg_cut))
-    # Load all possible hyperparameter datasets
-    for settings in hyperparamter_space:
-        train_class.load_train_data(
-            injury_adjusted=settings[0], avg_minutes_played_cutoff=settings[1]
+    # Load all possible hyperparameter datasets, reweighting injuries once
+    # per injury setting and sharing it across minutes cutoffs
+    for injury_adjusted in poss_inj_adj:
+        train_class.load_train_data_for_cutoffs(
+            injury_adjusted=injury_adjusted, avg_minutes_played_cutoffs=poss_avg_cut
         )
 
     # Create and train the NBA model
@@ -0,0 +1,127 @@
+"""Shared scheduler for nba_api requests."""
+import json
+import threading
+import time
+import pandas as pd
+import requests
+from objects.transport import nba_transport
+
+# errors stats.nba.com answers with when it is throttling us: hung or reset
+# connections, http errors and error pages that fail to parse as json
+THROTTLE_ERRORS = (requests.exceptions.RequestException, json.JSONDecodeError)
+
+
+class request_scheduler:
+    """Token bucket every nba_api request of the process goes through.
+
+    Requests only wait when the bucket is empty. A throttled request halves
+    the refill rate and is retried with exponential backoff; each success
+    lets the rate creep back up to max_rate.
+    """
+
+    def __init__(
+        self,
+        max_rate=2.0,
+        capacity=4,
+        min_rate=0.1,
+        rate_increase=0.1,
+        retries=4,
+        backoff_seconds=2,
+    ):
+        """Initialize."""
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.rate_increase = rate_increase
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+        self.stats = dict()
+
+    def wait(self):
+        """Block until the bucket has a token for the next request."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.last_refill) * self.rate
+                )
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                sleep_for = (1 - self.tokens) / self.rate
+            time.sleep(sleep_for)
+
+    def throttled(self):
+        """Halve the request rate and empty the bucket."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+
+    def succeeded(self):
+        """Let the request rate recover towards max_rate."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.rate_increase)
+
+    def record(self, endpoint_name, seconds=0.0, retried=False, failed=False):
+        """Add one request to the stats of its endpoint."""
+        with self.lock:
+            stats = self.stats.setdefault(
+                endpoint_name,
+                {"calls": 0, "retries": 0, "failures": 0, "total_seconds": 0.0},
+            )
+            if retried:
+                stats["retries"] += 1
+            elif failed:
+                stats["failures"] += 1
+            else:
+                stats["calls"] += 1
+                stats["total_seconds"] += seconds
+
+    def call(self, endpoint, **kwargs):
+        """Request an nba_api endpoint and get its data frames.
+
+        Replayed responses skip the bucket and retries entirely.
+        """
+        endpoint_name = endpoint.__name__
+        if nba_transport.mode == "replay":
+            return nba_transport.nba_api(endpoint, **kwargs)
+        for attempt in range(self.retries + 1):
+            self.wait()
+            start = time.monotonic()
+            try:
+                data_frames = nba_transport.nba_api(endpoint, **kwargs)
+            except THROTTLE_ERRORS as error:
+                self.throttled()
+                if attempt == self.retries:
+                    self.record(endpoint_name, failed=True)
+                    raise
+                self.record(endpoint_name, retried=True)
+                wait = self.backoff_seconds * 2 ** attempt
+                print(f"---->{endpoint_name} request failed ({type(error).__name__})."
+                      f" Trying again in {wait} seconds...")
+                time.sleep(wait)
+                continue
+            self.record(endpoint_name, seconds=time.monotonic() - start)
+            self.succeeded()
+            return data_frames
+
+    def report(self):
+        """Get per endpoint request counts, retries and mean latency."""
+        with self.lock:
+            report = pd.DataFrame.from_dict(
+                self.stats,
+                orient="index",
+                columns=["calls", "retries", "failures", "total_seconds"],
+            )
+        report["mean_seconds"] = report.total_seconds / report.calls.where(
+            report.calls > 0
+        )
+        return report.drop(columns="total_seconds")
+
+
+nba_requests = request_scheduler()
@@ -0,0 +1,121 @@
+"""Vectorized remaining regular season simulator."""
+import numpy as np
+import pandas as pd
+from objects.seeding import CONFERENCES
+
+
+class season_simulator:
+    """Simulate many finishes of the regular season and the play-in at once.
+
+    Teams are referred to by their position in team_ids. Every remaining game
+    is one column of a (seasons x games) array of draws, and the final
+    standings of each conference are ranked by win percentage, then win
+    percentage in games among the tied teams, then conference win percentage
+    and finally a coin flip. Seeds 7 and 8 go through the play-in.
+    """
+
+    def __init__(self, team_ids, conferences, played, remaining, home_win_probs):
+        """Initialize.
+
+        conferences gives each team's conference, played holds the finished
+        games (TEAM_ID_H, TEAM_ID_A and OUTCOME, 1 for a home win), remaining
+        the games left to play (TEAM_ID_H, TEAM_ID_A) and home_win_probs the
+        (home x away) probability that the home team wins.
+        """
+        self.team_ids = list(team_ids)
+        self.conferences = np.asarray(conferences)
+        team_index = pd.Series(np.arange(len(self.team_ids)), index=self.team_ids)
+        self.home_win_probs = np.asarray(home_win_probs, dtype=np.float64)
+        num_teams = len(self.team_ids)
+        played_home = team_index.loc[played.TEAM_ID_H].to_numpy()
+        played_away = team_index.loc[played.TEAM_ID_A].to_numpy()
+        home_won = played.OUTCOME.to_numpy() == 1
+        # head to head wins of each row team against each column team so far
+        self.played_wins = np.zeros((num_teams, num_teams), dtype=np.int64)
+        np.add.at(self.played_wins, (played_home[home_won], played_away[home_won]), 1)
+        np.add.at(self.played_wins, (played_away[~home_won], played_home[~home_won]), 1)
+        self.remaining_home = team_index.loc[remaining.TEAM_ID_H].to_numpy()
+        self.remaining_away = team_index.loc[remaining.TEAM_ID_A].to_numpy()
+        self.games_between = self.played_wins + self.played_wins.T
+        np.add.at(self.games_between, (self.remaining_home, self.remaining_away), 1)
+        np.add.at(self.games_between, (self.remaining_away, self.remaining_home), 1)
+
+    def head_to_head(self, home_won):
+        """Get (seasons x teams x teams) head to head wins at the end of the season."""
+        wins = np.repeat(self.played_wins[None].astype(np.int32), len(home_won), axis=0)
+        pairs = pd.DataFrame(
+            {"home": self.remaining_home, "away": self.remaining_away}
+        ).groupby(["home", "away"]).indices
+        for (home, away), games in pairs.items():
+            home_wins = home_won[:, games].sum(axis=1)
+            wins[:, home, away] += home_wins
+            wins[:, away, home] += len(games) - home_wins
+        return wins
+
+    def rank_conference(self, rng, teams, head_to_head):
+        """Get (seasons x conference teams) final standings, best team first."""
+        wins = head_to_head[:, teams][:, :, teams]
+        games = self.games_between[teams][:, teams]
+        total_games = self.games_between[teams].sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            win_pct = head_to_head[:, teams].sum(axis=2) / total_games
+            conference_pct = wins.sum(axis=2) / games.sum(axis=1)
+            tied = win_pct[:, :, None] == win_pct[:, None, :]
+            tied_pct = (tied * wins).sum(axis=2) / (tied * games).sum(axis=2)
+        keys = [
+            rng.random(win_pct.shape),
+            -np.nan_to_num(conference_pct, nan=0.5),
+            -np.nan_to_num(tied_pct, nan=0.5),
+            -np.nan_to_num(win_pct, nan=0.5),
+        ]
+        return teams[np.lexsort(keys, axis=-1)]
+
+    @staticmethod
+    def play_game(rng, home_win_probs, home, away):
+        """Play one game in every season and get (winner, loser)."""
+        home_wins = rng.random(len(home)) < home_win_probs[home, away]
+        return np.where(home_wins, home, away), np.where(home_wins, away, home)
+
+    def simulate(self, num_seasons=10000, seed=None, play_in_probs=None, ranks=None):
+        """Simulate num_seasons finishes of the season and get seed counts.
+
+        play_in_probs can replace home_win_probs for the play-in (i.e. with
+        0 and 1 for play-in games already played). ranks, each team's final
+        conference rank (1 is best), replaces the simulated standings once the
+        regular season is over. Returns a (teams x 8) frame indexed by team
+        id with how often each team got each seed of its conference.
+        """
+        rng = np.random.default_rng(seed)
+        if ranks is None:
+            home_won = rng.random(
+                (num_seasons, len(self.remaining_home))
+            ) < self.home_win_probs[self.remaining_home, self.remaining_away]
+            head_to_head = self.head_to_head(home_won)
+        if play_in_probs is None:
+            play_in_probs = self.home_win_probs
+        seed_counts = np.zeros((len(self.team_ids), 8), dtype=np.int64)
+        for conference in CONFERENCES:
+            teams = np.flatnonzero(self.conferences == conference)
+            if ranks is None:
+                standings = self.rank_conference(rng, teams, head_to_head)
+            else:
+                standings = np.repeat(
+                    teams[np.argsort(np.asarray(ranks)[teams], kind="stable")][None],
+                    num_seasons,
+                    axis=0,
+                )
+            seeds = [standings[:, seed] for seed in range(6)]
+            seven, seven_loser = self.play_game(
+                rng, play_in_probs, standings[:, 6], standings[:, 7]
+            )
+            nine, _ = self.play_game(rng, play_in_probs, standings[:, 8], standings[:, 9])
+            eight, _ = self.play_game(rng, play_in_probs, seven_loser, nine)
+            for seed, teams_with_seed in enumerate(seeds + [seven, eight]):
+                seed_counts[:, seed] += np.bincount(
+                    teams_with_seed, minlength=len(self.team_ids)
+                )
+        return pd.DataFrame(
+            seed_counts,
+            index=self.team_ids,
+            columns=[f"{seed}_SEED" for seed in range(1, 9)],
+        )
@@ -0,0 +1,68 @@
+"""On disk season store."""
+import datetime
+import json
+import os
+import threading
+import pandas as pd
+
+# Bump whenever the layout of stored season tables changes
+SEASON_STORE_VERSION = 1
+
+
+class season_store:
+    """Store the data tables of each season on disk.
+
+    Each dataset of a season (game_data, regular_boxes, ...) is one Parquet
+    file, next to a small JSON manifest holding the update timestamp of
+    every dataset, so callers only read the tables they use.
+    """
+
+    def __init__(self, path="data/season_store", version=SEASON_STORE_VERSION):
+        """Initialize."""
+        self.path = path
+        self.version = version
+        self.lock = threading.Lock()
+
+    def season_path(self, season):
+        """Get directory of a season."""
+        return os.path.join(self.path, f"v{self.version}", str(season))
+
+    def manifest_path(self, season):
+        """Get file path of a season manifest."""
+        return os.path.join(self.season_path(season), "manifest.json")
+
+    def manifest(self, season):
+        """Get dataset update timestamps of a season."""
+        path = self.manifest_path(season)
+        if not os.path.exists(path):
+            return dict()
+        with open(path, "r") as handle:
+            return json.load(handle)
+
+    def update_timestamp(self, season, dataset):
+        """Get when a stored dataset was last updated, None if not stored."""
+        timestamp = self.manifest(season).get(dataset)
+        if timestamp is None:
+            return None
+        return datetime.datetime.fromisoformat(timestamp)
+
+    def load(self, season, dataset):
+        """Load a stored dataset, None if not stored."""
+        path = os.path.join(self.season_path(season), dataset + ".parquet")
+        if (dataset not in self.manifest(season)) or (not os.path.exists(path)):
+            return None
+        return pd.read_parquet(path, memory_map=True)
+
+    def save(self, season, dataset, frame, update_timestamp):
+        """Write a dataset and record its update timestamp in the manifest."""
+        path = os.path.join(self.season_path(season), dataset + ".parquet")
+        with self.lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            frame.to_parquet(path + ".tmp")
+            os.replace(path + ".tmp", path)
+            manifest = self.manifest(season)
+            manifest.update({dataset: update_timestamp.isoformat()})
+            manifest_path = self.manifest_path(season)
+            with open(manifest_path + ".tmp", "w") as handle:
+                json.dump(manifest, handle, indent=2, sort_keys=True)
+            os.replace(manifest_path + ".tmp", manifest_path)
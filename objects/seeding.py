@@ -0,0 +1,97 @@
+"""Playoff seeding scenario sampler."""
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+CONFERENCES = ["EAST", "WEST"]
+SEED_LABELS = [f"{seed}_{conference}" for conference in CONFERENCES for seed in range(1, 9)]
+
+
+class seeding_sampler:
+    """Draw complete 1-8 seedings of both conferences from seed probabilities.
+
+    Takes the {team: {"1_EAST": prob, ...}} output of
+    current_state.get_playoff_picture_liklihood. A scenario is one team per
+    seed label (in SEED_LABELS order) with no team seeded twice, given as
+    indexes into team_abbs.
+    """
+
+    def __init__(self, seed_probs):
+        """Initialize."""
+        self.team_abbs = []
+        self.conference_teams = dict()
+        self.conference_probs = dict()
+        for conference in CONFERENCES:
+            labels = [f"{seed}_{conference}" for seed in range(1, 9)]
+            team_abbs = [
+                team_abb for team_abb, probs in seed_probs.items() if labels[0] in probs
+            ]
+            if len(team_abbs) < 8:
+                raise ValueError(f"Need at least 8 {conference} teams to seed.")
+            probs = np.nan_to_num(
+                np.array(
+                    [
+                        [seed_probs[team_abb][label] for label in labels]
+                        for team_abb in team_abbs
+                    ],
+                    dtype=np.float64,
+                )
+            )
+            # only teams that can make the playoffs are seeded (at least 8)
+            totals = probs.sum(axis=1)
+            keep = np.sort(
+                np.argsort(-totals, kind="stable")[: max(8, (totals > 0).sum())]
+            )
+            self.conference_teams[conference] = np.arange(len(keep)) + len(self.team_abbs)
+            self.conference_probs[conference] = probs[keep]
+            self.team_abbs.extend(team_abbs[i] for i in keep)
+
+    def sample_conference(self, rng, conference, num_scenarios):
+        """Draw (scenarios x 8) seedings of one conference.
+
+        Seeds are drawn in order for all scenarios at once, each from the
+        probabilities of the teams a scenario has not seeded yet. A scenario
+        whose remaining teams all have zero probability for a seed falls back
+        to their overall chance of making the playoffs.
+        """
+        probs = self.conference_probs[conference]
+        fallback = probs.sum(axis=1) + 1e-9
+        available = np.ones((num_scenarios, len(probs)), dtype=bool)
+        seeding = np.empty((num_scenarios, 8), dtype=np.int64)
+        for seed in range(8):
+            weights = available * probs[:, seed]
+            stuck = weights.sum(axis=1) == 0
+            weights[stuck] = available[stuck] * fallback
+            cumulative = weights.cumsum(axis=1)
+            draws = rng.random(num_scenarios) * cumulative[:, -1]
+            seeding[:, seed] = (cumulative <= draws[:, None]).sum(axis=1)
+            available[np.arange(num_scenarios), seeding[:, seed]] = False
+        return self.conference_teams[conference][seeding]
+
+    def sample(self, num_scenarios=5000, seed=None):
+        """Draw (scenarios x 16) seedings of both conferences."""
+        rng = np.random.default_rng(seed)
+        return np.concatenate(
+            [
+                self.sample_conference(rng, conference, num_scenarios)
+                for conference in CONFERENCES
+            ],
+            axis=1,
+        )
+
+    def scenarios(self, num_scenarios=5000, seed=None):
+        """Draw seedings and get the distinct ones with their frequencies."""
+        seedings, counts = np.unique(
+            self.sample(num_scenarios=num_scenarios, seed=seed),
+            axis=0,
+            return_counts=True,
+        )
+        return seedings, counts / num_scenarios
+
+    def most_likely_seeding(self):
+        """Get the consistent seeding with the highest product of seed probabilities."""
+        seeding = []
+        for conference in CONFERENCES:
+            log_probs = np.log(self.conference_probs[conference] + 1e-12)
+            teams, seeds = linear_sum_assignment(log_probs, maximize=True)
+            seeding.extend(self.conference_teams[conference][teams[np.argsort(seeds)]])
+        return np.array(seeding)
@@ -0,0 +1,52 @@
+"""Best-of-seven series probability engine."""
+import numpy as np
+
+# which games of a 2-2-1-1-1 series the higher seed hosts
+HIGHER_SEED_HOME_GAMES = [True, True, False, False, True, False, True]
+
+
+def series_outcome_probabilities(
+    prob_higher_wins_each_game, higher_already_won=0, lower_already_won=0
+):
+    """Get probabilities of each team winning the series in 4, 5, 6 and 7 games.
+
+    Walks the (higher_wins, lower_wins) score grid once instead of
+    enumerating every sequence of game outcomes. prob_higher_wins_each_game
+    holds the higher seed's win probability for games 1-7 along its first
+    axis; any trailing axes are treated as a batch of independent series.
+    Returns two arrays of shape (4, ...) indexed by series length minus 4.
+    """
+    if (higher_already_won > 4) or (lower_already_won > 4):
+        raise KeyError("A team cant win more than 4 games in a series")
+    probs = np.asarray(prob_higher_wins_each_game, dtype=np.float64)
+    if probs.shape[0] != 7:
+        raise ValueError("Need a win probability for each of the 7 games.")
+    batch_shape = probs.shape[1:]
+    grid = np.zeros((5, 5) + batch_shape, dtype=np.float64)
+    grid[higher_already_won, lower_already_won] = 1
+    for games_played in range(higher_already_won + lower_already_won, 7):
+        prob_game = probs[games_played]
+        for higher_wins in range(higher_already_won, 4):
+            lower_wins = games_played - higher_wins
+            if (lower_wins < lower_already_won) or (lower_wins > 3):
+                continue
+            mass = grid[higher_wins, lower_wins]
+            grid[higher_wins + 1, lower_wins] += mass * prob_game
+            grid[higher_wins, lower_wins + 1] += mass * (1 - prob_game)
+    return grid[4, :4].copy(), grid[:4, 4].copy()
+
+
+def possible_series_lengths(higher_already_won=0, lower_already_won=0):
+    """Get series lengths each team can still win the series in."""
+    shortest = max(4, higher_already_won + lower_already_won + 1)
+    higher_lengths = [
+        num_games
+        for num_games in range(shortest, 8)
+        if (num_games - 4 >= lower_already_won) and (higher_already_won < 4)
+    ]
+    lower_lengths = [
+        num_games
+        for num_games in range(shortest, 8)
+        if (num_games - 4 >= higher_already_won) and (lower_already_won < 4)
+    ]
+    return higher_lengths, lower_lengths
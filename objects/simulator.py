@@ -0,0 +1,363 @@
+"""Playoff bracket simulation and exact bracket propagation."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from objects.series import series_outcome_probabilities
+
+ROUNDS = ["R1", "R2", "R3", "R4"]
+SERIES_LENGTHS = [4, 5, 6, 7]
+# trials a simulate_parallel worker holds in memory at once
+WORKER_BATCH_TRIALS = 100000
+# who hosts a round 1-3 series: the team from the first slot of the matchup
+# (as get_probs_of_each_round always has) or the team with the better seed
+HOME_COURT_RULES = ["slot", "seed"]
+
+
+class bracket_simulator:
+    """Simulate many playoff brackets at once from the current tourney state.
+
+    Every trial is one full bracket. Teams are referred to by their position
+    in team_abbs, so a bracket slot holds one team index per trial and each
+    game of a series is a single draw over all trials.
+    """
+
+    def __init__(
+        self, script, seeds, series_probs, records, series_state=None, home_court="slot"
+    ):
+        """Initialize.
+
+        script maps each round to its (slot, slot) matchups, seeds maps each
+        seed label (i.e. "1_EAST") to a team abbreviation, series_probs is a
+        (7 x teams x teams) array of the probability that the row team wins
+        each game of a series where it is the higher seed, records holds each
+        team's regular season win percentage, series_state is the output of
+        current_state.get_current_tourney_state and home_court is one of
+        HOME_COURT_RULES.
+        """
+        if home_court not in HOME_COURT_RULES:
+            raise ValueError(
+                f"Home court rule must be one of {HOME_COURT_RULES}, got {home_court}."
+            )
+        self.script = script
+        self.home_court = home_court
+        self.seeds = seeds
+        self.team_abbs = list(seeds.values())
+        self.team_index = {team_abb: i for i, team_abb in enumerate(self.team_abbs)}
+        self.seed_slots = {
+            seed: self.team_index[team_abb] for seed, team_abb in seeds.items()
+        }
+        self.seed_numbers = np.array([int(seed[0]) for seed in seeds.keys()])
+        self.series_probs = np.asarray(series_probs, dtype=np.float64)
+        self.records = np.asarray(records, dtype=np.float64)
+        self.series_state = series_state or dict()
+
+    def already_won(self, round_str, matchup):
+        """Get how many games each team already won in a matchup of a round."""
+        wins = np.zeros(len(self.team_abbs), dtype=np.int64)
+        matchup_state = self.series_state.get(round_str, dict()).get(
+            "_".join(matchup), dict()
+        )
+        for team_abb, won in matchup_state.items():
+            wins[self.team_index[team_abb]] = won
+        return wins
+
+    def order_teams(self, round_str, team_1, team_2):
+        """Get the higher and lower seed of each trial's matchup.
+
+        Within a conference home court follows the home_court rule, in the
+        finals the better regular season record has it.
+        """
+        if round_str == "R4":
+            team_1_higher = self.records[team_1] > self.records[team_2]
+        elif self.home_court == "seed":
+            team_1_higher = self.seed_numbers[team_1] < self.seed_numbers[team_2]
+        else:
+            return team_1, team_2
+        return (
+            np.where(team_1_higher, team_1, team_2),
+            np.where(team_1_higher, team_2, team_1),
+        )
+
+    def play_series(self, rng, higher, lower, higher_won, lower_won):
+        """Play out one series in every trial and get winners and lengths."""
+        for game in range(7):
+            playing = (
+                (higher_won < 4) & (lower_won < 4) & (higher_won + lower_won == game)
+            )
+            higher_wins_game = rng.random(len(higher)) < self.series_probs[
+                game, higher, lower
+            ]
+            higher_won = higher_won + (playing & higher_wins_game)
+            lower_won = lower_won + (playing & ~higher_wins_game)
+        winner = np.where(higher_won == 4, higher, lower)
+        loser = np.where(higher_won == 4, lower, higher)
+        return winner, loser, higher_won + lower_won
+
+    def simulate(self, num_trials=100000, seed=None):
+        """Simulate num_trials brackets from the current tourney state.
+
+        Returns histograms (trial counts): "round_reach" with how often each
+        team won each round, and "series_lengths" with how often each team
+        won or lost a series of each round in 4, 5, 6 and 7 games. seed can
+        be anything np.random.default_rng takes, including a Generator.
+        """
+        rng = np.random.default_rng(seed)
+        num_teams = len(self.team_abbs)
+        slots = {
+            seed_label: np.full(num_trials, team)
+            for seed_label, team in self.seed_slots.items()
+        }
+        round_reach = np.zeros((num_teams, len(ROUNDS)), dtype=np.int64)
+        won_in = np.zeros((num_teams, len(ROUNDS), len(SERIES_LENGTHS)), dtype=np.int64)
+        lost_in = np.zeros_like(won_in)
+        for round_num, round_str in enumerate(ROUNDS):
+            for matchup in self.script[round_str]:
+                higher, lower = self.order_teams(
+                    round_str, slots[matchup[0]], slots[matchup[1]]
+                )
+                wins = self.already_won(round_str, matchup)
+                winner, loser, length = self.play_series(
+                    rng, higher, lower, wins[higher], wins[lower]
+                )
+                slots["_".join(matchup)] = winner
+                round_reach[:, round_num] += np.bincount(winner, minlength=num_teams)
+                won_in[:, round_num] += np.bincount(
+                    winner * 4 + length - 4, minlength=num_teams * 4
+                ).reshape(num_teams, 4)
+                lost_in[:, round_num] += np.bincount(
+                    loser * 4 + length - 4, minlength=num_teams * 4
+                ).reshape(num_teams, 4)
+        return {
+            "trials": num_trials,
+            "round_reach": pd.DataFrame(
+                round_reach, index=self.team_abbs, columns=ROUNDS
+            ),
+            "series_lengths": self.series_length_frame(won_in, lost_in),
+        }
+
+    def simulate_parallel(self, num_trials=1000000, seed=None, num_workers=None):
+        """Split num_trials brackets across a pool of worker processes.
+
+        Each worker simulates its share with its own stream spawned from
+        SeedSequence(seed) and reads the series probabilities from one shared
+        memory block, so results only depend on seed and num_workers.
+        """
+        num_workers = num_workers or os.cpu_count()
+        seed_sequences = np.random.SeedSequence(seed).spawn(num_workers)
+        worker_trials = [
+            num_trials // num_workers + (worker < num_trials % num_workers)
+            for worker in range(num_workers)
+        ]
+        memory = shared_memory.SharedMemory(create=True, size=self.series_probs.nbytes)
+        try:
+            shared_probs = np.ndarray(
+                self.series_probs.shape, dtype=np.float64, buffer=memory.buf
+            )
+            shared_probs[:] = self.series_probs
+            del shared_probs
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=attach_worker_simulator,
+                initargs=(
+                    memory.name,
+                    self.series_probs.shape,
+                    self.script,
+                    self.seeds,
+                    self.records,
+                    self.series_state,
+                    self.home_court,
+                ),
+            ) as pool:
+                results = list(
+                    pool.map(simulate_worker_trials, worker_trials, seed_sequences)
+                )
+        finally:
+            memory.close()
+            memory.unlink()
+        return merge_simulations(results)
+
+    def series_length_frame(self, won_in, lost_in):
+        """Arrange series length counts by team and round."""
+        index = pd.MultiIndex.from_product(
+            [self.team_abbs, ROUNDS], names=["TEAM_ABB", "ROUND"]
+        )
+        return pd.DataFrame(
+            np.concatenate(
+                [won_in.reshape(-1, 4), lost_in.reshape(-1, 4)], axis=1
+            ),
+            index=index,
+            columns=[f"WON_IN_{length}" for length in SERIES_LENGTHS]
+            + [f"LOST_IN_{length}" for length in SERIES_LENGTHS],
+        )
+
+
+# the bracket_simulator of a simulate_parallel worker process
+worker_simulator = None
+worker_memory = None
+
+
+def attach_worker_simulator(
+    memory_name, shape, script, seeds, records, series_state, home_court
+):
+    """Build a worker's simulator on the shared series probabilities."""
+    global worker_simulator, worker_memory
+    worker_memory = shared_memory.SharedMemory(name=memory_name)
+    series_probs = np.ndarray(shape, dtype=np.float64, buffer=worker_memory.buf)
+    worker_simulator = bracket_simulator(
+        script, seeds, series_probs, records, series_state, home_court
+    )
+
+
+def simulate_worker_trials(num_trials, seed_sequence):
+    """Simulate a worker's share of the brackets, in batches of one stream."""
+    rng = np.random.default_rng(seed_sequence)
+    return merge_simulations(
+        [
+            worker_simulator.simulate(
+                num_trials=min(WORKER_BATCH_TRIALS, num_trials - start), seed=rng
+            )
+            for start in range(0, max(num_trials, 1), WORKER_BATCH_TRIALS)
+        ]
+    )
+
+
+def merge_simulations(results):
+    """Add up the histograms of several simulate runs."""
+    return {
+        "trials": sum(result["trials"] for result in results),
+        "round_reach": sum(result["round_reach"] for result in results),
+        "series_lengths": sum(result["series_lengths"] for result in results),
+    }
+
+
+def series_win_matrix(series_probs):
+    """Get (higher x lower) probabilities of winning a series from 0-0."""
+    higher_wins_in, _ = series_outcome_probabilities(series_probs)
+    # a team never meets itself, its diagonal only needs to be finite
+    return np.nan_to_num(higher_wins_in.sum(axis=0))
+
+
+class bracket_propagation:
+    """Exact probability of each team winning each round of the bracket.
+
+    Each bracket slot is a vector of probabilities over the teams. A round
+    pairs its slots into (higher x lower) matchup probability matrices and
+    weighs them with a (higher x lower) series win matrix, so a round is a
+    few array products. Home court goes as in bracket_simulator.
+    """
+
+    def __init__(
+        self,
+        script,
+        seeds,
+        series_probs,
+        records,
+        series_state=None,
+        home_court="slot",
+        series_win=None,
+    ):
+        """Initialize (arguments as for bracket_simulator).
+
+        series_win, the (higher x lower) series win probabilities from 0-0, can
+        be passed in when it is already known.
+        """
+        if home_court not in HOME_COURT_RULES:
+            raise ValueError(
+                f"Home court rule must be one of {HOME_COURT_RULES}, got {home_court}."
+            )
+        self.script = script
+        self.home_court = home_court
+        self.team_abbs = list(seeds.values())
+        self.team_index = {team_abb: i for i, team_abb in enumerate(self.team_abbs)}
+        self.seeds = seeds
+        self.series_probs = np.asarray(series_probs, dtype=np.float64)
+        records = np.asarray(records, dtype=np.float64)
+        self.record_is_better = records[:, None] > records[None, :]
+        seed_numbers = np.array([int(seed[0]) for seed in seeds.keys()])
+        self.seed_is_better = seed_numbers[:, None] < seed_numbers[None, :]
+        self.series_state = series_state or dict()
+        if series_win is None:
+            series_win = series_win_matrix(self.series_probs)
+        self.series_win = series_win
+
+    def matchup_probabilities(self, round_str, higher_slots, lower_slots):
+        """Get (matchups x higher x lower) probabilities of each pairing."""
+        pairings = higher_slots[:, :, None] * lower_slots[:, None, :]
+        if round_str == "R4":
+            better = self.record_is_better
+        elif self.home_court == "seed":
+            better = self.seed_is_better
+        else:
+            return pairings
+        return pairings * better + np.swapaxes(pairings * ~better, 1, 2)
+
+    def series_in_progress(self, round_str, matchups, pairings):
+        """Get the started or finished series of a round.
+
+        Returns (matchup number, higher, lower, higher won, lower won) of each
+        pairing with a recorded series state.
+        """
+        round_state = self.series_state.get(round_str, dict())
+        in_progress = []
+        for num, matchup in enumerate(matchups):
+            if "_".join(matchup) not in round_state:
+                continue
+            matchup_state = round_state["_".join(matchup)]
+            for higher, lower in np.argwhere(pairings[num] > 0):
+                in_progress.append(
+                    (
+                        num,
+                        higher,
+                        lower,
+                        matchup_state[self.team_abbs[higher]],
+                        matchup_state[self.team_abbs[lower]],
+                    )
+                )
+        return in_progress
+
+    def propagate(self):
+        """Get every slot's team probabilities and each team's round wins.
+
+        Returns a dict with "slots" (seed label to team probabilities),
+        "round_reach" (teams x rounds probabilities of winning each round)
+        and "series" (round to list of its in-progress series, see
+        series_in_progress).
+        """
+        num_teams = len(self.team_abbs)
+        slots = {
+            seed: np.eye(num_teams)[self.team_index[team_abb]]
+            for seed, team_abb in self.seeds.items()
+        }
+        round_reach = np.zeros((num_teams, len(ROUNDS)))
+        series = dict()
+        for round_num, round_str in enumerate(ROUNDS):
+            matchups = self.script[round_str]
+            pairings = self.matchup_probabilities(
+                round_str,
+                np.stack([slots[matchup[0]] for matchup in matchups]),
+                np.stack([slots[matchup[1]] for matchup in matchups]),
+            )
+            series_win = np.repeat(self.series_win[None], len(matchups), axis=0)
+            series[round_str] = self.series_in_progress(round_str, matchups, pairings)
+            for num, higher, lower, higher_won, lower_won in series[round_str]:
+                higher_wins_in, _ = series_outcome_probabilities(
+                    self.series_probs[:, higher, lower],
+                    higher_already_won=higher_won,
+                    lower_already_won=lower_won,
+                )
+                series_win[num, higher, lower] = higher_wins_in.sum()
+            winners = (pairings * series_win).sum(axis=2) + (
+                pairings * (1 - series_win)
+            ).sum(axis=1)
+            for matchup, winner in zip(matchups, winners):
+                slots["_".join(matchup)] = winner
+            round_reach[:, round_num] = winners.sum(axis=0)
+        return {
+            "slots": slots,
+            "round_reach": pd.DataFrame(
+                round_reach, index=self.team_abbs, columns=ROUNDS
+            ),
+            "series": series,
+        }
@@ -1,7 +1,11 @@
 """Trainer class."""
 import datetime
 import time
-from objects.year import year
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from objects.year import year, FEATURE_SCHEMA_VERSION
+from objects.feature_store import feature_store
+from objects.request_scheduler import nba_requests
 
 
 class training_dataset:
@@ -13,6 +17,7 @@ class training_dataset:
         self.training_sets_cache = dict()
         self.years_cache = dict()
         self.since = since
+        self.store = feature_store(schema_version=FEATURE_SCHEMA_VERSION)
         print(
 
             f"Load data from {self.since}, {datetime.datetime.now().year - 2}"
@@ -20,6 +25,12 @@ class training_dataset:
         )
         self.load_year_data()
 
+    @staticmethod
+    def settings_key(injury_adjusted: bool, avg_minutes_played_cutoff: int):
+        """Get the training_sets_cache key of one setting."""
+        return (f"injury_adjusted = {injury_adjusted}, "
+                f"avg_minutes_played_cutoff = {avg_minutes_played_cutoff}")
+
     def get_training_dataset(
         self,
         injury_adjusted: bool,
@@ -28,73 +39,118 @@ class training_dataset:
     ):
 
         """Get training dataset."""
-        settings_string = f"injury_adjusted = {injury_adjusted}, avg_minutes_played_cutoff = {avg_minutes_played_cutoff}"
-        if (force_update == True) or (
-            self.since not in self.training_sets_cache.keys()
+        settings_string = self.settings_key(
+            injury_adjusted, avg_minutes_played_cutoff)
+        if (force_update == True) or any(
+            settings_string not in self.training_sets_cache.get(year_id, {})
+            for year_id in self.years_cache.keys()
         ):
-
-            self.load_train_data(
-                injury_adjusted=injury_adjusted,
-                avg_minutes_played_cutoff=avg_minutes_played_cutoff,
-            )
-        elif settings_string not in (
-         self.training_sets_cache.get(self.since).keys()):
-            self.load_train_data(
+            self.load_train_data_for_cutoffs(
                 injury_adjusted=injury_adjusted,
-                avg_minutes_played_cutoff=avg_minutes_played_cutoff,
+                avg_minutes_played_cutoffs=[avg_minutes_played_cutoff],
+                force_update=force_update,
             )
         all_train = []
         for year, settings_dict in self.training_sets_cache.items():
-            all_train.append(settings_dict.get(settings_string))
+            if settings_string in settings_dict:
+                all_train.append(settings_dict.get(settings_string))
         return pd.concat(all_train)
 
     def year(self, year_id):
         """Get year object."""
         return self.years_cache.get(year_id)
 
-    def load_year_data(self):
-        """Load all year classes."""
-        for year_get in range(self.since, datetime.datetime.now().year - 2):
+    def load_season(self, year_get, retries=3, backoff_seconds=30):
+        """Load one year class, retrying with exponential backoff on failure."""
+        for attempt in range(retries + 1):
             try:
-                self.years_cache.update({year_get: year(year_get)})
-            except:
-                print("Timeout occured. Try one more time.")
-                time.sleep(60)
-                self.years_cache.update({year_get: year(year_get)})
+                return year(year_get)
+            except Exception as error:
+                if attempt == retries:
+                    raise
+                wait = backoff_seconds * 2 ** attempt
+                print(f"Loading {year_get} failed ({error}). "
+                      f"Trying again in {wait} seconds...")
+                time.sleep(wait)
+
+    def load_year_data(self, max_workers=4, retries=3, backoff_seconds=30):
+        """Load all year classes concurrently.
+
+        Seasons are built on a thread pool; nba_api requests from every
+        season still go through the shared nba_requests rate limit.
+        """
+        seasons = list(range(self.since, datetime.datetime.now().year - 2))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self.load_season, year_get,
+                            retries, backoff_seconds): year_get
+                for year_get in seasons
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                year_get = futures[future]
+                self.years_cache.update({year_get: future.result()})
+                print(f"-->Loaded {year_get} ({done}/{len(seasons)} seasons)")
+        self.years_cache = dict(sorted(self.years_cache.items()))
+        print("-->nba_api requests made while loading:")
+        print(nba_requests.report())
 
     def load_train_data(
         self, injury_adjusted: bool, avg_minutes_played_cutoff: int
     ) -> None:
         """Load training and outcomes for all years."""
+        self.load_train_data_for_cutoffs(
+            injury_adjusted=injury_adjusted,
+            avg_minutes_played_cutoffs=[avg_minutes_played_cutoff],
+        )
+
+    def load_train_data_for_cutoffs(
+        self, injury_adjusted: bool, avg_minutes_played_cutoffs,
+        force_update: bool = False
+    ) -> None:
+        """Load training and outcomes for all years at several minutes cutoffs.
+
+        Rows already in the feature store are read back from disk; only
+        missing games are built, with injury reweighting done once per game
+        and team and shared by all cutoffs.
+        """
         print(
             (f"Loading training data for years from from {self.since}"
              f"until {datetime.datetime.now().year - 2}...")
         )
         for year_load in range(self.since, datetime.datetime.now().year - 2):
-            print(
-                (f"---->Loading training for {year_load} "
-                 f"with injury_adjustments = {injury_adjusted}"
-                 f"avg_minutes_played_cutoff = {avg_minutes_played_cutoff}...")
-            )
-            training = self.year(year_load).get_train_for_all_playoff_games(
-                injury_adjusted=injury_adjusted,
-                avg_minutes_played_cutoff=avg_minutes_played_cutoff,
-            )
-            if year_load not in self.training_sets_cache.keys():
-                self.training_sets_cache.update(
-                    {
-                        year_load: {
-                            (f"injury_adjusted = {injury_adjusted}"
-                             f"avg_mins_cutoff = {avg_minutes_played_cutoff}"
-                             ): training
-                        }
-                    }
+            game_ids = self.year(year_load).playoff_game_data.GAME_ID.tolist()
+            missing = set()
+            for avg_minutes_played_cutoff in avg_minutes_played_cutoffs:
+                if force_update:
+                    missing.update(game_ids)
+                else:
+                    missing.update(self.store.missing_game_ids(
+                        year_load, injury_adjusted,
+                        avg_minutes_played_cutoff, game_ids))
+            if len(missing) > 0:
+                print(
+                    (f"---->Loading training for {year_load} "
+                     f"with injury_adjustments = {injury_adjusted}"
+                     f"avg_minutes_played_cutoffs = {avg_minutes_played_cutoffs}...")
                 )
-            else:
+                missing = [game_id for game_id in game_ids if game_id in missing]
+                trainings = self.year(
+                    year_load).get_train_for_all_playoff_games_by_cutoff(
+                    injury_adjusted=injury_adjusted,
+                    avg_minutes_played_cutoffs=avg_minutes_played_cutoffs,
+                    game_ids=missing,
+                )
+                for avg_minutes_played_cutoff, training in trainings.items():
+                    self.store.save(
+                        year_load, injury_adjusted, avg_minutes_played_cutoff,
+                        training.assign(GAME_ID=missing))
+            if year_load not in self.training_sets_cache.keys():
+                self.training_sets_cache.update({year_load: dict()})
+            for avg_minutes_played_cutoff in avg_minutes_played_cutoffs:
+                training = self.store.get(
+                    year_load, injury_adjusted,
+                    avg_minutes_played_cutoff, game_ids).drop("GAME_ID", axis=1)
                 self.training_sets_cache.get(year_load).update(
-                    {
-                        (f"injury_adjusted = {injury_adjusted}"
-                         f"avg_mins_cutoff = {avg_minutes_played_cutoff}"
-                         ): training
-                    }
+                    {self.settings_key(injury_adjusted,
+                                       avg_minutes_played_cutoff): training}
                 )
@@ -0,0 +1,101 @@
+"""Record and replay transport for network responses."""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import threading
+import requests
+
+TRANSPORT_MODES = ["live", "record", "replay"]
+
+
+class transport:
+    """Route nba_api calls and scraped pages through an optional archive.
+
+    In "live" mode requests go straight to the network. "record" also keeps
+    every response and writes them to a gzip compressed pickle archive at
+    exit (or on save()), and "replay" answers only from that archive, so a
+    recorded session runs with zero network. The mode and archive default
+    to the NBA_TRANSPORT and NBA_TRANSPORT_ARCHIVE environment variables.
+    """
+
+    def __init__(self, mode=None, path=None):
+        """Initialize."""
+        self.lock = threading.Lock()
+        self.set_mode(mode, path)
+
+    def set_mode(self, mode=None, path=None):
+        """Select the transport mode and archive file."""
+        mode = mode or os.environ.get("NBA_TRANSPORT", "live")
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(
+                f"Transport mode must be one of {TRANSPORT_MODES}, got {mode}."
+            )
+        self.mode = mode
+        self.path = path or os.environ.get(
+            "NBA_TRANSPORT_ARCHIVE", "data/transport_archive.pickle.gz"
+        )
+        self.responses_cache = None
+        if (self.mode == "record") and not getattr(self, "save_registered", False):
+            atexit.register(self.save)
+            self.save_registered = True
+
+    @staticmethod
+    def request_key(kind, name, params):
+        """Hash a request so identical requests share one archive entry."""
+        request = json.dumps([kind, name, params], sort_keys=True, default=str)
+        return hashlib.sha1(request.encode()).hexdigest()
+
+    @property
+    def responses(self):
+        """Get the archived responses, loading the archive on first use."""
+        if self.responses_cache is None:
+            if os.path.exists(self.path):
+                with gzip.open(self.path, "rb") as handle:
+                    self.responses_cache = pickle.load(handle)
+            else:
+                self.responses_cache = dict()
+        return self.responses_cache
+
+    def save(self):
+        """Write the recorded responses to the archive."""
+        if (self.mode != "record") or (self.responses_cache is None):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path + ".tmp", "wb") as handle:
+            pickle.dump(self.responses, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self.path + ".tmp", self.path)
+
+    def fetch(self, kind, name, params, live_fetch):
+        """Get a response from the archive or the network, depending on mode."""
+        key = self.request_key(kind, name, params)
+        if self.mode == "replay":
+            with self.lock:
+                if key not in self.responses:
+                    raise KeyError(
+                        f"No recorded {kind} response for {name} {params} in {self.path}."
+                    )
+                return self.responses[key]
+        response = live_fetch()
+        if self.mode == "record":
+            with self.lock:
+                self.responses[key] = response
+        return response
+
+    def nba_api(self, endpoint, **kwargs):
+        """Get the data frames of an nba_api endpoint."""
+        return self.fetch(
+            "nba_api",
+            endpoint.__name__,
+            kwargs,
+            lambda: endpoint(**kwargs).get_data_frames(),
+        )
+
+    def get_text(self, url):
+        """Get the text of a web page."""
+        return self.fetch("page", url, {}, lambda: requests.get(url).text)
+
+
+nba_transport = transport()
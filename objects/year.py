@@ -1,20 +1,63 @@
 """Year class."""
 import pandas as pd
 import datetime
+import functools
+from collections import OrderedDict
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from nba_api.stats import endpoints
 from nba_api.stats.library.parameters import SeasonType, SeasonTypePlayoffs
 from objects.helper import nba_team_ids, scrape_current_nba_injuries
-import time
+from objects.request_scheduler import nba_requests
+from objects.availability import playoff_availability
+from objects.features import FEATURE_STATS, summarize_groups, build_feature_frame
 import math
 import numpy as np
 
+# Bump whenever feature definitions change so stored features get rebuilt
+FEATURE_SCHEMA_VERSION = 2
+
+# Tables a year loads, in the order the eager constructor loads them
+DATASETS = [
+    "roster_info",
+    "game_data",
+    "regular_boxes",
+    "playoff_game_data",
+    "playoff_boxes",
+    "sit_or_injured_playoff",
+]
+dataset_locks_guard = threading.Lock()
+# Bits of the roster position bitmask, e.g. "G-F" is G | F
+POSITION_BITS = {"G": 1, "F": 2, "C": 4}
+
+
+def synchronized(dataset):
+    """Let only one thread at a time load or refresh a dataset of a year."""
+
+    def decorator(getter):
+        @functools.wraps(getter)
+        def wrapper(self):
+            with self.dataset_lock(dataset):
+                return getter(self)
+
+        return wrapper
+
+    return decorator
+
 
 class year:
     """Create year class."""
 
-    def __init__(self, year):
-        """Initialize year class."""
+    def __init__(self, year, store=None, lazy=False):
+        """Initialize year class.
+
+        With lazy=True nothing is loaded up front and each table is fetched the
+        first time it is used; see prefetch to load several at once. With a
+        season_store, tables are read from disk before going to the API and
+        are written back whenever they are fetched or updated.
+        """
         self.year = year
+        self.store = store
         next_year_abb = str(self.year - 1999)
         if len(next_year_abb) == 1:
             next_year_abb = "0" + next_year_abb
@@ -23,8 +66,22 @@ class year:
         self.playoff_game_data_cache = pd.DataFrame()
         self.playoff_boxes_cache = pd.DataFrame()
         self.regular_boxes_cache = pd.DataFrame()
-        self.injured_cache = dict()
+        self.regular_boxes_version = 0
+        self.regular_boxes_summary_cache = pd.DataFrame()
+        self.regular_boxes_summary_indexed_cache = pd.DataFrame()
+        self.regular_boxes_summary_version = -1
+        self.injured_cache = None
         self.roster_info_cache = pd.DataFrame()
+        self.roster_players_cache = dict()
+        self.roster_index_cache = dict()
+        self.roster_index_source = None
+        self.roster_index_version = 0
+        self.standings_cache = pd.DataFrame()
+        self.reweight_cache = OrderedDict()
+        self.reweight_cache_maxsize = 512
+        self.reweight_cache_hits = 0
+        self.reweight_cache_misses = 0
+        self.standings_source = None
         self.regular_boxes_cache_only_played = pd.DataFrame()
         self.update_timestamp_game_data = datetime.datetime.now()
         self.update_timestamp_regular_boxes = datetime.datetime.now()
@@ -32,17 +89,41 @@ class year:
         self.update_timestamp_playoff_boxes = datetime.datetime.now()
         self.update_timestamp_sit_or_injured_playoff = datetime.datetime.now()
         self.update_timestamp_roster_info = datetime.datetime.now()
+        if lazy:
+            return
         print(f"-->Loading data for {self.season}...")
-        loader_1 = self.roster_info.copy()
-        loader_2 = self.game_data.copy()
-        loader_3 = self.regular_boxes.copy()
-        loader_4 = self.playoff_game_data.copy()
-        loader_5 = self.playoff_boxes.copy()
-        loader_6 = self.sit_or_injured_playoff.copy()
+        self.prefetch(DATASETS)
+
+    def __getstate__(self):
+        """Drop dataset locks when pickling."""
+        state = self.__dict__.copy()
+        state.pop("dataset_locks", None)
+        return state
+
+    def dataset_lock(self, dataset):
+        """Get the lock guarding one dataset."""
+        with dataset_locks_guard:
+            locks = self.__dict__.setdefault("dataset_locks", dict())
+            return locks.setdefault(dataset, threading.RLock())
+
+    def prefetch(self, datasets=DATASETS, max_workers=4):
+        """Load several datasets concurrently.
+
+        Datasets another one depends on are loaded once, by whichever thread
+        gets to them first, since each dataset has its own lock.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(getattr, self, dataset) for dataset in datasets
+            ]
+            for future in futures:
+                future.result()
 
     @property
+    @synchronized("roster_info")
     def roster_info(self):
         """Define roster info."""
+        self.restore("roster_info")
         if (self.roster_info_cache.empty) or (
             (datetime.datetime.now().year in [self.year, self.year + 1])
             and (
@@ -51,49 +132,168 @@ class year:
             )
         ) and (self.playoff_game_data.shape[0] == 0):
             print("---->Loading or updating player info...")
-            all_players = []
-            for team_id in self.regular_boxes.TEAM_ID.unique():
-                roster = endpoints.commonteamroster.CommonTeamRoster(
-                    team_id=team_id, season=self.season
-                ).get_data_frames()[0]
-                all_players.append(roster)
-                time.sleep(2)
-            all_players = pd.concat(all_players)
-            self.roster_info_cache = all_players[
-                ["TeamID", "PLAYER_ID", "POSITION"]
-            ].rename({"TeamID": "TEAM_ID"}, axis=1)
+            team_ids = self.regular_boxes.TEAM_ID.unique().tolist()
+            team_players = (
+                self.current_team_players()
+                if datetime.datetime.now().year in [self.year, self.year + 1]
+                else dict()
+            )
+            if self.roster_info_cache.empty:
+                changed_teams = team_ids
+            else:
+                changed_teams = [
+                    team_id
+                    for team_id in team_ids
+                    if self.roster_players_cache.get(team_id)
+                    != team_players.get(team_id, frozenset())
+                ]
+                changed_teams += [
+                    team_id
+                    for team_id in self.moved_player_teams()
+                    if team_id not in changed_teams
+                ]
+            if len(changed_teams) > 0:
+                fetched = self.fetch_rosters(changed_teams)
+                if not self.roster_info_cache.empty:
+                    fetched = pd.concat(
+                        [
+                            self.roster_info_cache.query(
+                                "TEAM_ID not in @changed_teams"
+                            ),
+                            fetched,
+                        ]
+                    )
+                self.roster_info_cache = fetched
+                self.roster_players_cache.update(
+                    {team_id: team_players.get(team_id, frozenset()) for team_id in changed_teams}
+                )
             self.update_timestamp_roster_info = datetime.datetime.now()
+            self.persist("roster_info")
         return self.roster_info_cache
 
-    @property
-    def game_data(self) -> None:
-        """Set game data in object cache in long format."""
-        if self.game_data_cache.shape[0] == 0:
-            print(
-                "---->Loading regular season game data for this year for the first time..."
+    def restore(self, dataset):
+        """Fill an empty cache from the season store."""
+        if (self.store is None) or (not getattr(self, dataset + "_cache").empty):
+            return
+        stored = self.store.load(self.season, dataset)
+        if stored is None:
+            return
+        setattr(self, dataset + "_cache", stored)
+        setattr(
+            self,
+            "update_timestamp_" + dataset,
+            self.store.update_timestamp(self.season, dataset),
+        )
+        if dataset == "regular_boxes":
+            self.regular_boxes_version += 1
+        if dataset == "roster_info":
+            roster_players = self.store.load(self.season, "roster_players")
+            if roster_players is not None:
+                self.roster_players_cache = {
+                    team_id: frozenset(players)
+                    for team_id, players in roster_players.groupby("TEAM_ID").PLAYER_ID
+                }
+
+    def persist(self, dataset):
+        """Write a cache and its update timestamp to the season store."""
+        if self.store is None:
+            return
+        self.store.save(
+            self.season,
+            dataset,
+            getattr(self, dataset + "_cache"),
+            getattr(self, "update_timestamp_" + dataset),
+        )
+        if dataset == "roster_info":
+            roster_players = pd.DataFrame(
+                [
+                    (team_id, player_id)
+                    for team_id, players in self.roster_players_cache.items()
+                    for player_id in players
+                ],
+                columns=["TEAM_ID", "PLAYER_ID"],
             )
-            all_games = (
-                endpoints.leaguegamefinder.LeagueGameFinder(
-                    season_type_nullable=SeasonType.regular, season_nullable=self.season
-                )
-                .get_data_frames()[0]
-                .query("TEAM_ID in @nba_team_ids")
+            self.store.save(
+                self.season,
+                "roster_players",
+                roster_players,
+                self.update_timestamp_roster_info,
             )
-            time.sleep(2)
-        elif (datetime.datetime.now().year in [self.year, self.year + 1]) and (
-            datetime.datetime.now() - self.update_timestamp_game_data
-            > datetime.timedelta(seconds=3600)
-        ) and (self.playoff_game_data.shape[0] == 0):
-            print("Updating resular season game data.")
-            all_games = (
-                endpoints.leaguegamefinder.LeagueGameFinder(
-                    season_type_nullable=SeasonType.regular, season_nullable=self.season
-                ).get_data_frames()[0].query("TEAM_ID in @nba_team_ids").query("WL.notna()")
+
+    def current_team_players(self):
+        """Get each team's current players from one league wide request."""
+        players = nba_requests.call(
+            endpoints.commonallplayers.CommonAllPlayers,
+            is_only_current_season=1,
+            season=self.season,
+        )[0].query("TEAM_ID in @nba_team_ids")
+        return {
+            team_id: frozenset(player_ids)
+            for team_id, player_ids in players.groupby("TEAM_ID").PERSON_ID
+        }
+
+    def moved_player_teams(self):
+        """Get teams whose cached roster lists a player who last played for another team, and that team."""
+        latest_team = (
+            self.regular_boxes.sort_values("GAME_DATE", kind="stable")
+            .groupby("PLAYER_ID")
+            .TEAM_ID.last()
+        )
+        roster = self.roster_info_cache
+        latest = latest_team.reindex(roster.PLAYER_ID).to_numpy(dtype=np.float64)
+        moved = ~np.isnan(latest) & (latest != roster.TEAM_ID.to_numpy())
+        return list(
+            dict.fromkeys(
+                roster.TEAM_ID.to_numpy()[moved].tolist() + latest[moved].astype(int).tolist()
             )
-            self.update_timestamp_game_data = datetime.datetime.now()
-            time.sleep(2)
-        else:
-            return self.game_data_cache
+        )
+
+    def fetch_rosters(self, team_ids, max_workers=8):
+        """Get rosters of teams concurrently.
+
+        Requests still go through nba_requests, so the pool only overlaps
+        waiting on the API and never exceeds the shared request budget.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            rosters = list(
+                pool.map(
+                    lambda team_id: nba_requests.call(
+                        endpoints.commonteamroster.CommonTeamRoster,
+                        team_id=team_id,
+                        season=self.season,
+                    )[0],
+                    team_ids,
+                )
+            )
+        return pd.concat(rosters)[["TeamID", "PLAYER_ID", "POSITION"]].rename(
+            {"TeamID": "TEAM_ID"}, axis=1
+        )
+
+    @staticmethod
+    def date_from(cached):
+        """Get the newest GAME_DATE of a cache as a date_from_nullable string."""
+        return pd.to_datetime(cached.GAME_DATE).max().strftime("%m/%d/%Y")
+
+    @staticmethod
+    def append_games(cached, new_rows, sort_by_game_id=False):
+        """Add newly fetched rows to a cache, replacing rows of the same games.
+
+        New rows start from the newest cached date so games that were not
+        final at the last pull are fetched again and replace the old rows.
+        """
+        if len(new_rows) == 0:
+            return cached
+        appended = pd.concat(
+            [cached[~cached.GAME_ID.isin(new_rows.GAME_ID)], new_rows]
+        )
+        if sort_by_game_id:
+            appended = appended.sort_values("GAME_ID")
+        return appended.reset_index(drop=True)
+
+    @staticmethod
+    def pivot_games(all_games, no_games_message=None):
+        """Pivot long LeagueGameFinder rows to one wide row per game."""
+        all_games = all_games.copy()
         all_games["HOME_AWAY"] = [
             "H" if x == 1 else "A" for x in all_games.MATCHUP.str.contains("vs")
         ]
@@ -128,7 +328,8 @@ class year:
         all_games = all_games.pivot(index="GAME_ID", columns="HOME_AWAY").reset_index()
         all_games.columns = all_games.columns.map(lambda x: "_".join(x))
         if len(all_games) == 0:
-            print("No regular season games have occurred.")
+            if no_games_message is not None:
+                print(no_games_message)
             columns = [
                 "GAME_DATE",
                 "HOME_AWAY",
@@ -167,46 +368,109 @@ class year:
             .drop(["GAME_DATE_A"], axis=1)
             .copy()
         )
-        self.game_data_cache = all_games.query(
+        return all_games.query(
             "TEAM_ID_H in @nba_team_ids & TEAM_ID_A in @nba_team_ids"
         )
+
+    @property
+    @synchronized("game_data")
+    def game_data(self) -> None:
+        """Set game data in object cache in wide format.
+
+        Once loaded, in season refreshes only request games since the newest
+        cached GAME_DATE and append them.
+        """
+        self.restore("game_data")
+        if self.game_data_cache.shape[0] == 0:
+            print(
+                "---->Loading regular season game data for this year for the first time..."
+            )
+            all_games = (
+                nba_requests.call(
+                    endpoints.leaguegamefinder.LeagueGameFinder,
+                    season_type_nullable=SeasonType.regular,
+                    season_nullable=self.season,
+                )[0]
+                .query("TEAM_ID in @nba_team_ids")
+            )
+            self.game_data_cache = self.pivot_games(
+                all_games, "No regular season games have occurred."
+            )
+            self.persist("game_data")
+        elif (datetime.datetime.now().year in [self.year, self.year + 1]) and (
+            datetime.datetime.now() - self.update_timestamp_game_data
+            > datetime.timedelta(seconds=3600)
+        ) and (self.playoff_game_data.shape[0] == 0):
+            print("Updating resular season game data.")
+            new_games = (
+                nba_requests.call(
+                    endpoints.leaguegamefinder.LeagueGameFinder,
+                    season_type_nullable=SeasonType.regular,
+                    season_nullable=self.season,
+                    date_from_nullable=self.date_from(self.game_data_cache),
+                )[0]
+                .query("TEAM_ID in @nba_team_ids")
+                .query("WL.notna()")
+            )
+            self.game_data_cache = self.append_games(
+                self.game_data_cache, self.pivot_games(new_games), sort_by_game_id=True
+            )
+            self.update_timestamp_game_data = datetime.datetime.now()
+            self.persist("game_data")
         return self.game_data_cache
 
     @property
+    @synchronized("regular_boxes")
     def regular_boxes(self) -> None:
         """Set regular season player box summaries."""
+        self.restore("regular_boxes")
         if self.regular_boxes_cache.shape[0] == 0:
             print(
                 "---->Loading regular season player box data for this year for the first time..."
             )
             self.regular_boxes_cache = (
-                endpoints.PlayerGameLogs(
-                    season_type_nullable=SeasonType.regular, season_nullable=self.season
-                )
-                .get_data_frames()[0]
+                nba_requests.call(
+                    endpoints.PlayerGameLogs,
+                    season_type_nullable=SeasonType.regular,
+                    season_nullable=self.season,
+                )[0]
                 .query("TEAM_ID in @nba_team_ids")
             )
-            time.sleep(2)
+            self.regular_boxes_version += 1
+            self.persist("regular_boxes")
         elif ((datetime.datetime.now().year in [self.year, self.year + 1]) and (
             datetime.datetime.now() - self.update_timestamp_regular_boxes
             > datetime.timedelta(seconds=3600)
         )) and (self.playoff_game_data.shape[0] == 0):
             print("---->Updating regular season box data...")
-            self.regular_boxes_cache = (
-                endpoints.PlayerGameLogs(
-                    season_type_nullable=SeasonType.regular, season_nullable=self.season
-                )
-                .get_data_frames()[0]
+            new_boxes = (
+                nba_requests.call(
+                    endpoints.PlayerGameLogs,
+                    season_type_nullable=SeasonType.regular,
+                    season_nullable=self.season,
+                    date_from_nullable=self.date_from(self.regular_boxes_cache),
+                )[0]
                 .query("TEAM_ID in @nba_team_ids")
             )
             self.update_timestamp_regular_boxes = datetime.datetime.now()
-            time.sleep(2)
+            if len(new_boxes) > 0:
+                self.regular_boxes_cache = self.append_games(
+                    self.regular_boxes_cache, new_boxes
+                )
+                self.regular_boxes_version += 1
+            self.persist("regular_boxes")
         return self.regular_boxes_cache
 
     @property
+    @synchronized("regular_boxes_summary")
     def regular_boxes_summary(self):
-        """Get box scores summary."""
-        regular_boxes = self.regular_boxes.copy()
+        """Get box scores summary.
+
+        Only recomputed when regular_boxes has been refetched since the last call.
+        """
+        regular_boxes = self.regular_boxes
+        if self.regular_boxes_summary_version == self.regular_boxes_version:
+            return self.regular_boxes_summary_cache
         regular_boxes_summary = (
             regular_boxes[
                 [
@@ -245,148 +509,119 @@ class year:
         regular_boxes_summary = regular_boxes_summary.rename(
             columns={"PLAYER_ID_": "PLAYER_ID", "TEAM_ID_": "TEAM_ID"}
         ).copy()
-        return regular_boxes_summary
+        self.regular_boxes_summary_cache = regular_boxes_summary
+        self.regular_boxes_summary_indexed_cache = regular_boxes_summary.set_index(
+            ["TEAM_ID", "PLAYER_ID"], drop=False
+        ).sort_index()
+        self.regular_boxes_summary_version = self.regular_boxes_version
+        return self.regular_boxes_summary_cache
+
+    @property
+    def regular_boxes_summary_indexed(self):
+        """Get box scores summary indexed by (TEAM_ID, PLAYER_ID)."""
+        self.regular_boxes_summary
+        return self.regular_boxes_summary_indexed_cache
+
+    def get_team_box_summary(self, team_id):
+        """Get box scores summary rows for one team."""
+        try:
+            return self.regular_boxes_summary_indexed.loc[team_id].reset_index(drop=True)
+        except KeyError:
+            return self.regular_boxes_summary.iloc[0:0]
 
     @property
+    @synchronized("playoff_game_data")
     def playoff_game_data(self) -> None:
-        """Set playoff game data in object cache in wide format."""
+        """Set playoff game data in object cache in wide format.
+
+        Once loaded, in season refreshes only request games since the newest
+        cached GAME_DATE and append them.
+        """
+        self.restore("playoff_game_data")
         if self.playoff_game_data_cache.shape[0] == 0:
             print("---->Loading playoff game data for this year for the first time...")
             all_games = (
-                endpoints.leaguegamefinder.LeagueGameFinder(
+                nba_requests.call(
+                    endpoints.leaguegamefinder.LeagueGameFinder,
                     season_type_nullable=SeasonTypePlayoffs.playoffs,
                     season_nullable=self.season,
-                ).get_data_frames()[0].query("TEAM_ID in @nba_team_ids").query("WL.notna()")
+                )[0]
+                .query("TEAM_ID in @nba_team_ids")
+                .query("WL.notna()")
             )
-            time.sleep(2)
+            self.playoff_game_data_cache = self.pivot_games(
+                all_games, "No playoff games have occured"
+            )
+            self.persist("playoff_game_data")
         elif (datetime.datetime.now().year in [self.year, self.year + 1]) and (
             datetime.datetime.now() - self.update_timestamp_playoff_game_data
             > datetime.timedelta(seconds=3600)
         ):
             print("Updating playoff game data.")
-            all_games = (
-                endpoints.leaguegamefinder.LeagueGameFinder(
+            new_games = (
+                nba_requests.call(
+                    endpoints.leaguegamefinder.LeagueGameFinder,
                     season_type_nullable=SeasonTypePlayoffs.playoffs,
                     season_nullable=self.season,
-                )
-                .get_data_frames()[0]
+                    date_from_nullable=self.date_from(self.playoff_game_data_cache),
+                )[0]
                 .query("TEAM_ID in @nba_team_ids")
             )
-            self.update_timestamp_playoff_game_data = datetime.datetime.now()
-            time.sleep(2)
-        else:
-            return self.playoff_game_data_cache
-        all_games["HOME_AWAY"] = [
-            "H" if x == 1 else "A" for x in all_games.MATCHUP.str.contains("vs")
-        ]
-        all_games = all_games[
-            [
-                "GAME_ID",
-                "GAME_DATE",
-                "HOME_AWAY",
-                "TEAM_ID",
-                "TEAM_ABBREVIATION",
-                "PTS",
-                "FGM",
-                "FGA",
-                "FG_PCT",
-                "FG3M",
-                "FG3A",
-                "FG3_PCT",
-                "FTM",
-                "FTA",
-                "FT_PCT",
-                "OREB",
-                "DREB",
-                "REB",
-                "AST",
-                "STL",
-                "BLK",
-                "TOV",
-                "PF",
-                "PLUS_MINUS",
-            ]
-        ].copy()
-        all_games = all_games.pivot(index="GAME_ID", columns="HOME_AWAY").reset_index()
-        all_games.columns = all_games.columns.map(lambda x: "_".join(x))
-        if len(all_games) == 0:
-            print("No playoff games have occured")
-            columns = [
-                "GAME_DATE",
-                "HOME_AWAY",
-                "TEAM_ID",
-                "TEAM_ABBREVIATION",
-                "PTS",
-                "FGM",
-                "FGA",
-                "FG_PCT",
-                "FG3M",
-                "FG3A",
-                "FG3_PCT",
-                "FTM",
-                "FTA",
-                "FT_PCT",
-                "OREB",
-                "DREB",
-                "REB",
-                "AST",
-                "STL",
-                "BLK",
-                "TOV",
-                "PF",
-                "PLUS_MINUS",
-            ]
-            new_columns = [name + suffix for name in columns for suffix in ["_H", "_A"]]
-            new_columns.append("GAME_ID")
-            all_games = pd.DataFrame(columns=new_columns)
-        all_games["OUTCOME"] = [
-            0 if PLUS_MINUS_H < 0 else 1 for PLUS_MINUS_H in all_games.PLUS_MINUS_H
-        ]
-        all_games = (
-            all_games.rename(
-                columns={"GAME_DATE_H": "GAME_DATE", "GAME_ID_": "GAME_ID"}
+            self.playoff_game_data_cache = self.append_games(
+                self.playoff_game_data_cache,
+                self.pivot_games(new_games),
+                sort_by_game_id=True,
             )
-            .drop(["GAME_DATE_A"], axis=1)
-            .copy()
-        )
-        self.playoff_game_data_cache = all_games.query(
-            "TEAM_ID_H in @nba_team_ids & TEAM_ID_A in @nba_team_ids"
-        )
+            self.update_timestamp_playoff_game_data = datetime.datetime.now()
+            self.persist("playoff_game_data")
         return self.playoff_game_data_cache
 
     @property
+    @synchronized("playoff_boxes")
     def playoff_boxes(self):
-        """Load player boxes for all playoff games."""
+        """Load player boxes for all playoff games.
+
+        Once loaded, in season refreshes only request boxes since the newest
+        cached GAME_DATE and append them.
+        """
+        self.restore("playoff_boxes")
         if self.playoff_boxes_cache.shape[0] == 0:
             print(
                 "---->Loading playoff player box data for this year for the first time..."
             )
             post_boxes = (
-                endpoints.PlayerGameLogs(
+                nba_requests.call(
+                    endpoints.PlayerGameLogs,
                     season_type_nullable=SeasonTypePlayoffs.playoffs,
                     season_nullable=self.season,
-                )
-                .get_data_frames()[0]
+                )[0]
                 .query("TEAM_ID in @nba_team_ids")
             )
-            time.sleep(2)
+            self.playoff_boxes_cache = self.rank_playoff_boxes(post_boxes)
+            self.persist("playoff_boxes")
         elif (datetime.datetime.now().year in [self.year, self.year + 1]) and (
             datetime.datetime.now() - self.update_timestamp_playoff_boxes
             > datetime.timedelta(seconds=3600)
         ):
             print("---->Updating playoff box season game data.")
-            post_boxes = (
-                endpoints.PlayerGameLogs(
+            new_boxes = (
+                nba_requests.call(
+                    endpoints.PlayerGameLogs,
                     season_type_nullable=SeasonTypePlayoffs.playoffs,
                     season_nullable=self.season,
-                )
-                .get_data_frames()[0]
+                    date_from_nullable=self.date_from(self.playoff_boxes_cache),
+                )[0]
                 .query("TEAM_ID in @nba_team_ids")
             )
+            self.playoff_boxes_cache = self.append_games(
+                self.playoff_boxes_cache, self.rank_playoff_boxes(new_boxes)
+            )
             self.update_timestamp_playoff_boxes = datetime.datetime.now()
-            time.sleep(2)
-        else:
-            return self.playoff_boxes_cache
+            self.persist("playoff_boxes")
+        return self.playoff_boxes_cache
+
+    def rank_playoff_boxes(self, post_boxes):
+        """Add each player's regular season play time rank to playoff boxes."""
         playoff_boxes_cache = post_boxes[
             [
                 "GAME_ID",
@@ -422,15 +657,61 @@ class year:
         player_team_rank = check_play_time_dist[
             ["PLAYER_ID", "Regular_Season_Play_Time_Rank"]
         ]
-        self.playoff_boxes_cache = playoff_boxes_cache.merge(
+        return playoff_boxes_cache.merge(
             player_team_rank, how="left", on="PLAYER_ID"
         )
-        return self.playoff_boxes_cache
 
     def get_playoff_results_up_to_date(self, date: str):  # Input string as "%Y-%m-%d"
         """Get current playoff results."""
         return self.playoff_game_data.query("GAME_DATE < @date")
 
+    @property
+    def roster_index(self):
+        """Get position and roster arrays built once per roster_info pull.
+
+        Holds player -> position bitmask, team -> player id array with the
+        aligned bitmask array, and team -> bitmask -> player id array.
+        """
+        roster_info = self.roster_info
+        if self.roster_index_source is roster_info:
+            return self.roster_index_cache
+        position_mask = (
+            roster_info.POSITION.fillna("")
+            .str.split("-")
+            .map(
+                lambda positions: sum(
+                    POSITION_BITS.get(position, 0) for position in set(positions)
+                )
+            )
+        )
+        positions = pd.DataFrame(
+            {
+                "TEAM_ID": roster_info.TEAM_ID.to_numpy(),
+                "PLAYER_ID": roster_info.PLAYER_ID.to_numpy(),
+                "MASK": position_mask.to_numpy(),
+            }
+        )
+        player_mask = positions.drop_duplicates("PLAYER_ID").set_index("PLAYER_ID").MASK
+        team_players, team_masks, class_players = dict(), dict(), dict()
+        for team_id, team in positions.drop_duplicates(
+            ["TEAM_ID", "PLAYER_ID"]
+        ).groupby("TEAM_ID"):
+            team_players[team_id] = team.PLAYER_ID.to_numpy()
+            team_masks[team_id] = team.MASK.to_numpy()
+            class_players[team_id] = {
+                mask: team_players[team_id][team_masks[team_id] == mask]
+                for mask in np.unique(team_masks[team_id])
+            }
+        self.roster_index_cache = {
+            "player_mask": player_mask.to_dict(),
+            "team_players": team_players,
+            "team_masks": team_masks,
+            "class_players": class_players,
+        }
+        self.roster_index_source = roster_info
+        self.roster_index_version += 1
+        return self.roster_index_cache
+
     def get_team_rosters_from_regular_season(self):
         """Organize dictionary where keys are team_ids and items are lists of player_ids."""
         rosters_df = self.roster_info[["PLAYER_ID", "TEAM_ID"]].drop_duplicates()
@@ -444,123 +725,181 @@ class year:
         """Organize nested dictionary where outer key is team_id inner key is game_date and item is list of player_ids."""
         played = self.playoff_boxes[["TEAM_ID", "PLAYER_ID", "GAME_ID"]]
         nested_dict = {team: dict() for team in played.TEAM_ID.unique()}
-        for team in nested_dict.keys():
-            played_team = played.query("TEAM_ID == @team")
-            nested_dict[team].update(
-                {
-                    game_id: players.tolist()
-                    for game_id, players in played_team.groupby("GAME_ID")["PLAYER_ID"]
-                }
-            )
+        for (team, game_id), players in played.groupby(["TEAM_ID", "GAME_ID"])[
+            "PLAYER_ID"
+        ]:
+            nested_dict[team][game_id] = players.tolist()
         return nested_dict
 
     @property
+    @synchronized("sit_or_injured_playoff")
     def sit_or_injured_playoff(self):
-        """Gets whether players sat on each playoff game date for year in nested dict."""
-        if len(self.injured_cache) == 0 or (
+        """Get which roster players sat out each playoff game.
+
+        Returns a playoff_availability built in one pass over playoff_boxes;
+        use sat_out(team_id, game_id) for the players that did not play.
+        """
+        if self.injured_cache is None or (
             (datetime.datetime.now().year in [self.year, self.year + 1])
             and (
                 datetime.datetime.now() - self.update_timestamp_sit_or_injured_playoff
                 > datetime.timedelta(seconds=3600)
             )
         ):
-            roster_dict = self.get_team_rosters_from_regular_season()
-            played_dict = self.get_players_played_in_each_playoff_game()
-            injury_dict = {
-                team: {
-                    game_id: [
-                        player
-                        for player in roster_dict[team]
-                        if player not in played_dict.get(team, {}).get(game_id, [])
-                    ]
-                    for game_id in played_dict.get(team, {}).keys()
-                }
-                for team in roster_dict.keys()
-            }
-            self.injured_cache = injury_dict
+            self.injured_cache = playoff_availability(
+                self.roster_index["team_players"],
+                self.playoff_boxes[["GAME_ID", "TEAM_ID", "PLAYER_ID"]],
+            )
             self.update_timestamp_sit_or_injured_playoff = datetime.datetime.now()
         return self.injured_cache
 
     def reweight_replacements_for_missing_player(
         self, possible_replacement_player_ids, remove_injured, injured_player_id
     ):
-        """Reweights replacement players for ONE missing player."""
+        """Reweights replacement players for ONE missing player.
+
+        Replacements below a common minutes level are topped up to it, starting
+        at the injured player's minutes and raising the level a minute at a time
+        up to 48. Every level is evaluated at once, so the final allocation is
+        found without looping over players.
+        """
         if len(possible_replacement_player_ids) == 0:
             raise KeyError("No valid replacements.")
         team_id = remove_injured.reset_index(drop=1).TEAM_ID[0]
-        possile_replacement_box_summary = self.regular_boxes_summary.query(
-            "(PLAYER_ID in @possible_replacement_player_ids) & (TEAM_ID == @team_id)"
-        ).sort_values(by="MIN_mean", ascending=False)
+        team_summary = self.get_team_box_summary(team_id)
+        possile_replacement_box_summary = team_summary[
+            team_summary.PLAYER_ID.isin(possible_replacement_player_ids)
+        ].sort_values(by="MIN_mean", ascending=False)
         min_diff = (
             self.regular_boxes_summary.query("PLAYER_ID == @injured_player_id")
             .reset_index(drop=0)
             .MIN_mean[0]
         )
-        max_minutes = (
-            min_diff.copy()
-        )  # set max minutes to number of minutes adjusted player was playing and incriment up if needed
         if min_diff <= 0:
             return pd.DataFrame(columns=["PLAYER_ID"])
-        while (min_diff > 0) & (max_minutes <= 48):
-            replacement_df = []
-            for index, row in possile_replacement_box_summary.iterrows():
-                if (min_diff > 0) & (row.MIN_mean < max_minutes):
-                    min_diff = min_diff - (max_minutes - row.MIN_mean)
-                    if min_diff < 0:
-                        player_min_new = max_minutes + min_diff
-                    else:
-                        player_min_new = max_minutes
-                    prop_orig_time = player_min_new / row.MIN_mean
-                    updated_stats = (
-                        pd.DataFrame(row)
-                        .T.drop(
-                            [
-                                "PLAYER_ID",
-                                "TEAM_ID",
-                                "FG_PCT_mean",
-                                "FG3_PCT_mean",
-                                "FT_PCT_mean",
-                                "PLUS_MINUS_mean",
-                            ],
-                            axis=1,
-                        )
-                        .mul(prop_orig_time, axis=0)
-                        .copy()
-                    )
-                    updated_stats["FG_PCT_mean"] = (
-                        updated_stats.FGM_mean / updated_stats.FGA_mean
-                    )
-                    updated_stats["FG3_PCT_mean"] = (
-                        updated_stats.FG3M_mean / updated_stats.FG3A_mean
-                    )
-                    updated_stats["FT_PCT_mean"] = (
-                        updated_stats.FTM_mean / updated_stats.FTA_mean
-                    )
-                    updated_stats["PLAYER_ID"] = row.PLAYER_ID
-                    updated_stats["TEAM_ID"] = row.TEAM_ID
-                    replacement_df.append(updated_stats)
-            max_minutes += 1
-        replacement_df = pd.concat(replacement_df)
-        if min_diff > 0:
+        minutes = possile_replacement_box_summary.MIN_mean.to_numpy(dtype=np.float64)
+        # max minutes starts at the adjusted player's minutes and increments up if needed
+        max_minutes = min_diff + np.arange(max(math.floor(48 - min_diff) + 1, 0))
+        minutes_short = np.clip(max_minutes[:, np.newaxis] - minutes, 0, None)
+        minutes_given = np.cumsum(minutes_short.sum(axis=1))
+        filled = np.flatnonzero(minutes_given >= min_diff)
+        if len(filled) == 0:
             raise KeyError(
                 f"Warning: Not enough eligible players on bench to account for all injuries with full 40 minutes of play for injury_id {injured_player_id}."
             )
+        level = filled[0]
+        min_diff_left = min_diff - (minutes_given[level - 1] if level > 0 else 0)
+        given_through = np.cumsum(minutes_short[level])
+        played_more = (minutes_short[level] > 0) & (
+            given_through - minutes_short[level] < min_diff_left
+        )
+        player_min_new = max_minutes[level] - np.clip(
+            given_through - min_diff_left, 0, None
+        )
+        replacements = possile_replacement_box_summary[played_more]
+        scaled_columns = [
+            column
+            for column in replacements.columns
+            if column
+            not in [
+                "PLAYER_ID",
+                "TEAM_ID",
+                "FG_PCT_mean",
+                "FG3_PCT_mean",
+                "FT_PCT_mean",
+                "PLUS_MINUS_mean",
+            ]
+        ]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prop_orig_time = player_min_new[played_more] / minutes[played_more]
+            replacement_df = pd.DataFrame(
+                replacements[scaled_columns].to_numpy(dtype=np.float64)
+                * prop_orig_time[:, np.newaxis],
+                columns=scaled_columns,
+                index=replacements.index,
+            )
+        replacement_df["FG_PCT_mean"] = replacement_df.FGM_mean / replacement_df.FGA_mean
+        replacement_df["FG3_PCT_mean"] = (
+            replacement_df.FG3M_mean / replacement_df.FG3A_mean
+        )
+        replacement_df["FT_PCT_mean"] = replacement_df.FTM_mean / replacement_df.FTA_mean
+        replacement_df["PLAYER_ID"] = replacements.PLAYER_ID
+        replacement_df["TEAM_ID"] = replacements.TEAM_ID
         return replacement_df
 
+    @property
+    def standings(self):
+        """Get regular season standings, rebuilt once per game_data refresh.
+
+        Indexed by TEAM_ID with home, road and overall wins and losses and
+        the matching win percentages.
+        """
+        game_data = self.game_data
+        if self.standings_source is game_data:
+            return self.standings_cache
+        home = game_data.groupby("TEAM_ID_H").OUTCOME.agg(["sum", "count"])
+        road = game_data.groupby("TEAM_ID_A").OUTCOME.agg(["sum", "count"])
+        abbreviations = pd.concat(
+            [
+                game_data[["TEAM_ID_H", "TEAM_ABBREVIATION_H"]].set_axis(
+                    ["TEAM_ID", "TEAM_ABBREVIATION"], axis=1
+                ),
+                game_data[["TEAM_ID_A", "TEAM_ABBREVIATION_A"]].set_axis(
+                    ["TEAM_ID", "TEAM_ABBREVIATION"], axis=1
+                ),
+            ]
+        ).drop_duplicates("TEAM_ID")
+        standings = abbreviations.set_index("TEAM_ID").sort_index()
+        standings["HOME_W"] = home["sum"].reindex(standings.index).fillna(0).astype(int)
+        standings["HOME_L"] = (
+            home["count"].reindex(standings.index).fillna(0).astype(int)
+            - standings.HOME_W
+        )
+        # OUTCOME is from the home team's side, so road wins are road games lost by the home team
+        standings["ROAD_L"] = road["sum"].reindex(standings.index).fillna(0).astype(int)
+        standings["ROAD_W"] = (
+            road["count"].reindex(standings.index).fillna(0).astype(int)
+            - standings.ROAD_L
+        )
+        standings["W"] = standings.HOME_W + standings.ROAD_W
+        standings["L"] = standings.HOME_L + standings.ROAD_L
+        with np.errstate(divide="ignore", invalid="ignore"):
+            standings["HOME_WIN_PCT"] = standings.HOME_W / (
+                standings.HOME_W + standings.HOME_L
+            )
+            standings["ROAD_WIN_PCT"] = 1 - standings.ROAD_L / (
+                standings.ROAD_W + standings.ROAD_L
+            )
+            standings["WIN_PCT"] = standings.W / (standings.W + standings.L)
+        self.standings_cache = standings
+        self.standings_source = game_data
+        return self.standings_cache
+
     def get_team_record(self, team_abb):
         """Get win loss record."""
-        home_games = np.array(
-            self.game_data.query("TEAM_ABBREVIATION_H == 'BOS'").OUTCOME
-        )
-        away_games = 1 - np.array(
-            self.game_data.query("TEAM_ABBREVIATION_A == 'BOS'").OUTCOME
+        records = self.standings.set_index("TEAM_ABBREVIATION").WIN_PCT
+        return float(records.get(team_abb, np.nan))
+
+    def get_playoff_ranks(self):
+        """Get each team's official conference rank, all tiebreakers applied, by TEAM_ID."""
+        return (
+            nba_requests.call(
+                endpoints.LeagueStandingsV3,
+                season=self.season,
+                season_type=SeasonType.regular,
+            )[0]
+            .set_index("TeamID")
+            .PlayoffRank
         )
-        return np.mean(np.append(home_games, away_games))
 
     def reweight_stats(
         self, team_id, game_id, avg_minutes_played_cutoff, games_ahead_of_today
     ):
-        """Get injury reweighted predicted stats."""
+        """Get injury reweighted predicted stats.
+
+        Tables are cached by team, set of injured players and data version, so
+        repeated injury situations are a lookup. Callers must not modify them.
+        """
         if game_id == 0:
             injured = [
                 player_id
@@ -570,77 +909,69 @@ class year:
                 if not math.isnan(player_id)
             ]
         else:
-            injured = self.sit_or_injured_playoff[team_id][game_id]
-        on_roster_still = self.get_team_rosters_from_regular_season()[team_id]
+            injured = self.sit_or_injured_playoff.sat_out(team_id, game_id)
+        roster_index = self.roster_index
+        on_roster_still = roster_index["team_players"][team_id]
         # Only considered injury needing replacement if average minutes is greater than 30
-        injured = (
-            self.regular_boxes_summary.query(
-                "(TEAM_ID == @team_id) & (PLAYER_ID in @injured) & (MIN_mean > 25) & (PLAYER_ID in @on_roster_still)"
-            )
-            .reset_index(drop=1)
-            .PLAYER_ID.tolist()
-        )  # remove players below injury adjustment cutoff (we dont care if a player that doesnt play is injured)
-        remove_injured = self.regular_boxes_summary.query(
-            "(PLAYER_ID not in @injured) & (PLAYER_ID in @on_roster_still) & (TEAM_ID == @team_id)"
+        team_summary = self.get_team_box_summary(team_id)
+        injured = team_summary[
+            team_summary.PLAYER_ID.isin(injured)
+            & (team_summary.MIN_mean > 25)
+            & team_summary.PLAYER_ID.isin(on_roster_still)
+        ].PLAYER_ID.tolist()  # remove players below injury adjustment cutoff (we dont care if a player that doesnt play is injured)
+        key = (
+            team_id,
+            frozenset(injured),
+            self.regular_boxes_summary_version,
+            self.roster_index_version,
         )
+        with self.dataset_lock("reweight_cache"):
+            if key in self.reweight_cache:
+                self.reweight_cache.move_to_end(key)
+                self.reweight_cache_hits += 1
+                return self.reweight_cache[key]
+            self.reweight_cache_misses += 1
+        reweighted = self.replace_injured_players(
+            team_id, injured, team_summary, roster_index
+        )
+        with self.dataset_lock("reweight_cache"):
+            self.reweight_cache[key] = reweighted
+            if len(self.reweight_cache) > self.reweight_cache_maxsize:
+                self.reweight_cache.popitem(last=False)
+        return reweighted
+
+    def reweight_cache_info(self):
+        """Get hits, misses and size of the reweight_stats cache."""
+        return {
+            "hits": self.reweight_cache_hits,
+            "misses": self.reweight_cache_misses,
+            "size": len(self.reweight_cache),
+            "maxsize": self.reweight_cache_maxsize,
+        }
+
+    def replace_injured_players(self, team_id, injured, team_summary, roster_index):
+        """Get a team's player table with injured players' minutes handed out."""
+        on_roster_still = roster_index["team_players"][team_id]
+        remove_injured = team_summary[
+            ~team_summary.PLAYER_ID.isin(injured)
+            & team_summary.PLAYER_ID.isin(on_roster_still)
+        ]
+        any_position = on_roster_still[~np.isin(on_roster_still, injured)]
+        forwards = roster_index["class_players"][team_id].get(
+            POSITION_BITS["F"], on_roster_still[:0]
+        )
+        forwards = forwards[~np.isin(forwards, injured)]
         for injured_player_id in injured:
-            try:
-                injured_pos = (
-                    self.roster_info.query("PLAYER_ID == @injured_player_id")
-                    .reset_index(drop=1)
-                    .POSITION[0]
-                )
-            except KeyError:
+            injured_mask = roster_index["player_mask"].get(injured_player_id)
+            if injured_mask is None:
                 continue  # player is no longer on roster
-            # Possible Positions: ['G-F', 'F-G', 'G', 'C', 'F-C', 'F', 'C-F']
-            if (injured_pos == "G-F") or (injured_pos == "F-G"):
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & ('G' in POSITION | 'F' in POSITION) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
-            if injured_pos == "G":
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & ('G' in POSITION) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
-            if injured_pos == "C":
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & ('C' in POSITION) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
-            if (injured_pos == "F-C") or (injured_pos == "C-F"):
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & ('C' in POSITION | 'F' in POSITION) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
-            if injured_pos == "F":
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & ('F' in POSITION) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
+            # Only pure forwards are replaced by their own position first; every
+            # other position has always been replaced from the whole roster,
+            # which is what the stored model was trained on
+            if injured_mask == POSITION_BITS["F"]:
+                possible_replacement_player_ids = forwards
             else:
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
+                possible_replacement_player_ids = any_position
             try:
                 replacement_df = self.reweight_replacements_for_missing_player(
                     possible_replacement_player_ids=possible_replacement_player_ids,
@@ -648,15 +979,8 @@ class year:
                     injured_player_id=injured_player_id,
                 )
             except KeyError:  # if none left in position move to other positions
-                possible_replacement_player_ids = (
-                    self.roster_info.query(
-                        "(PLAYER_ID in @on_roster_still) & (PLAYER_ID not in @injured)"
-                    )
-                    .reset_index(drop=1)
-                    .PLAYER_ID.tolist()
-                )
                 replacement_df = self.reweight_replacements_for_missing_player(
-                    possible_replacement_player_ids=possible_replacement_player_ids,
+                    possible_replacement_player_ids=any_position,
                     remove_injured=remove_injured,
                     injured_player_id=injured_player_id,
                 )
@@ -672,18 +996,119 @@ class year:
     def get_regular_season_summary_stats_unadjusted(self, team_id):
         """Get team regular season summary statistics for all teams."""
         on_roster_still = self.get_team_rosters_from_regular_season()[team_id]
-        players_summary = self.regular_boxes_summary.query(
-            "(PLAYER_ID in @on_roster_still) & (TEAM_ID == @team_id)"
-        )
+        team_summary = self.get_team_box_summary(team_id)
+        players_summary = team_summary[team_summary.PLAYER_ID.isin(on_roster_still)]
         return players_summary.drop(["TEAM_ID", "PLUS_MINUS_mean"], axis=1)
 
     def get_home_win_percentage(self, team_id):
         """Get home win percentage for team."""
-        return self.game_data.query("TEAM_ID_H == @team_id").OUTCOME.mean()
+        return self.standings.HOME_WIN_PCT.get(team_id, np.nan)
 
     def get_away_win_percentage(self, team_id):
         """Get away win percentage for team."""
-        return 1 - self.game_data.query("TEAM_ID_A == @team_id").OUTCOME.mean()
+        return self.standings.ROAD_WIN_PCT.get(team_id, np.nan)
+
+    def get_team_games(self, games):
+        """Stack the home and away side of games into GAME_ID, GAMES_AHEAD, TEAM_ID rows."""
+        return pd.concat(
+            [
+                games[["GAME_ID", "GAMES_AHEAD", "TEAM_ID_H"]].rename(
+                    columns={"TEAM_ID_H": "TEAM_ID"}
+                ),
+                games[["GAME_ID", "GAMES_AHEAD", "TEAM_ID_A"]].rename(
+                    columns={"TEAM_ID_A": "TEAM_ID"}
+                ),
+            ]
+        )
+
+    def get_player_tables(self, team_games, injury_adjusted: bool):
+        """Get the available player table for every (game, horizon, team) at once.
+
+        team_games has GAME_ID, GAMES_AHEAD and TEAM_ID columns, with GAME_ID 0
+        marking an upcoming game. Returns one long frame of player summaries
+        carrying those key columns.
+        """
+        player_tables = []
+        unadjusted = dict()
+        for game_id, games_ahead_of_today, team_id in (
+            team_games[["GAME_ID", "GAMES_AHEAD", "TEAM_ID"]]
+            .drop_duplicates()
+            .itertuples(index=False)
+        ):
+            if injury_adjusted:
+                players = self.reweight_stats(
+                    team_id=team_id,
+                    game_id=game_id,
+                    avg_minutes_played_cutoff=0,
+                    games_ahead_of_today=games_ahead_of_today,
+                )
+            else:
+                if team_id not in unadjusted:
+                    unadjusted[team_id] = self.get_regular_season_summary_stats_unadjusted(
+                        team_id=team_id
+                    )
+                players = unadjusted[team_id]
+            player_tables.append(
+                players.assign(
+                    GAME_ID=game_id, GAMES_AHEAD=games_ahead_of_today, TEAM_ID=team_id
+                )
+            )
+        return pd.concat(player_tables, ignore_index=True)
+
+    def aggregate_player_tables(self, player_tables, games, avg_minutes_played_cutoff):
+        """Turn long player tables into one feature row per game.
+
+        Every (game, horizon, team) group is summarized straight from the
+        player stat arrays and written into the fixed FEATURE_COLUMNS layout.
+        """
+        keys = ["GAME_ID", "GAMES_AHEAD", "TEAM_ID"]
+        players = player_tables[player_tables.MIN_mean >= avg_minutes_played_cutoff]
+        group_ids, groups = pd.MultiIndex.from_frame(players[keys]).factorize()
+        team_summaries, team_sizes = summarize_groups(
+            group_ids,
+            players[[f"{stat}_mean" for stat in FEATURE_STATS]].to_numpy(
+                dtype=np.float64
+            ),
+            len(groups),
+        )
+        standings = self.standings
+        return build_feature_frame(
+            team_summaries,
+            team_sizes,
+            home_groups=groups.get_indexer(
+                pd.MultiIndex.from_arrays(
+                    [games.GAME_ID, games.GAMES_AHEAD, games.TEAM_ID_H]
+                )
+            ),
+            away_groups=groups.get_indexer(
+                pd.MultiIndex.from_arrays(
+                    [games.GAME_ID, games.GAMES_AHEAD, games.TEAM_ID_A]
+                )
+            ),
+            home_win=standings.HOME_WIN_PCT.reindex(games.TEAM_ID_A).to_numpy(),
+            road_win=standings.ROAD_WIN_PCT.reindex(games.TEAM_ID_A).to_numpy(),
+        )
+
+    def get_features_for_games(
+        self, games, injury_adjusted: bool, avg_minutes_played_cutoff
+    ):
+        """Return model features for many games in one pass.
+
+        games has GAME_ID, TEAM_ID_H and TEAM_ID_A columns and optionally
+        GAMES_AHEAD (default 0); GAME_ID 0 marks an upcoming game. Rows come back
+        in the order of games.
+        """
+        games = games.reset_index(drop=True).copy()
+        if "GAMES_AHEAD" not in games.columns:
+            games["GAMES_AHEAD"] = 0
+        player_tables = self.get_player_tables(
+            team_games=self.get_team_games(games), injury_adjusted=injury_adjusted
+        )
+        return self.aggregate_player_tables(
+            player_tables=player_tables,
+            games=games,
+            avg_minutes_played_cutoff=avg_minutes_played_cutoff,
+        )
 
     def feature_creator(
         self,
@@ -695,92 +1120,18 @@ class year:
         games_ahead_of_today,
     ):
         """Define feature creator."""
-        if injury_adjusted:
-            home_reweighted = (
-                self.reweight_stats(
-                    team_id=home_team,
-                    game_id=game_id,
-                    avg_minutes_played_cutoff=avg_minutes_played_cutoff,
-                    games_ahead_of_today=games_ahead_of_today,
-                )
-                .query("MIN_mean >= @avg_minutes_played_cutoff")
-                .drop(["MIN_mean", "PLAYER_ID"], axis=1)
-                .add_suffix("_H")
-                .rename(columns=lambda x: x.replace("_mean", ""))
-            )
-            depth_at_cutoff = home_reweighted.shape[0]
-            home_reweighted = (
-                home_reweighted.agg(["mean", "median", "max"]).stack().to_frame().T
-            )
-            home_reweighted.columns = [
-                "_".join(map(str, c)) for c in home_reweighted.columns
-            ]
-            home_reweighted["depth_at_cutoff_H"] = depth_at_cutoff
-            home_reweighted["home_win_percentage"] = self.get_home_win_percentage(
-                away_team
-            )
-            away_reweighted = (
-                self.reweight_stats(
-                    team_id=away_team,
-                    game_id=game_id,
-                    avg_minutes_played_cutoff=avg_minutes_played_cutoff,
-                    games_ahead_of_today=games_ahead_of_today,
-                )
-                .query("MIN_mean >= @avg_minutes_played_cutoff")
-                .drop(["MIN_mean", "PLAYER_ID"], axis=1)
-                .add_suffix("_A")
-                .rename(columns=lambda x: x.replace("_mean", ""))
-            )
-            depth_at_cutoff = away_reweighted.shape[0]
-            away_reweighted = (
-                away_reweighted.agg(["mean", "median", "max"]).stack().to_frame().T
-            )
-            away_reweighted.columns = [
-                "_".join(map(str, c)) for c in away_reweighted.columns
-            ]
-            away_reweighted["depth_at_cutoff_A"] = depth_at_cutoff
-            away_reweighted["road_win_percentage"] = self.get_away_win_percentage(
-                away_team
-            )
-        else:
-            home_reweighted = (
-                self.get_regular_season_summary_stats_unadjusted(team_id=home_team)
-                .query("MIN_mean >= @avg_minutes_played_cutoff")
-                .drop(["MIN_mean", "PLAYER_ID"], axis=1)
-                .add_suffix("_H")
-                .rename(columns=lambda x: x.replace("_mean", ""))
-            )
-            depth_at_cutoff = home_reweighted.shape[0]
-            home_reweighted = (
-                home_reweighted.agg(["mean", "median", "max"]).stack().to_frame().T
-            )
-            home_reweighted.columns = [
-                "_".join(map(str, c)) for c in home_reweighted.columns
-            ]
-            home_reweighted["depth_at_cutoff_H"] = depth_at_cutoff
-            home_reweighted["home_win_percentage"] = self.get_home_win_percentage(
-                away_team
-            )
-            away_reweighted = (
-                self.get_regular_season_summary_stats_unadjusted(team_id=away_team)
-                .query("MIN_mean >= @avg_minutes_played_cutoff")
-                .drop(["MIN_mean", "PLAYER_ID"], axis=1)
-                .add_suffix("_A")
-                .rename(columns=lambda x: x.replace("_mean", ""))
-            )
-            depth_at_cutoff = away_reweighted.shape[0]
-            away_reweighted = (
-                away_reweighted.agg(["mean", "median", "max"]).stack().to_frame().T
-            )
-            away_reweighted.columns = [
-                "_".join(map(str, c)) for c in away_reweighted.columns
-            ]
-            away_reweighted["depth_at_cutoff_A"] = depth_at_cutoff
-            away_reweighted["road_win_percentage"] = self.get_away_win_percentage(
-                away_team
-            )
-        adjusted_df = pd.concat([home_reweighted, away_reweighted], axis=1)
-        return adjusted_df
+        return self.get_features_for_games(
+            games=pd.DataFrame(
+                {
+                    "GAME_ID": [game_id],
+                    "GAMES_AHEAD": [games_ahead_of_today],
+                    "TEAM_ID_H": [home_team],
+                    "TEAM_ID_A": [away_team],
+                }
+            ),
+            injury_adjusted=injury_adjusted,
+            avg_minutes_played_cutoff=avg_minutes_played_cutoff,
+        )
 
     def get_features_for_game(
         self, game_id, injury_adjusted: bool, avg_minutes_played_cutoff
@@ -822,17 +1173,56 @@ class year:
         )
         return features
 
+    def get_features_for_upcoming_matchups(
+        self, matchups, injury_adjusted: bool, avg_minutes_played_cutoff
+    ):
+        """Return model features for many upcoming games at once.
+
+        matchups is a list of (home_team, away_team, games_ahead_of_today) tuples.
+        """
+        if len(matchups) == 0:
+            return pd.DataFrame()
+        games = pd.DataFrame(matchups, columns=["TEAM_ID_H", "TEAM_ID_A", "GAMES_AHEAD"])
+        games["GAME_ID"] = 0
+        return self.get_features_for_games(
+            games=games,
+            injury_adjusted=injury_adjusted,
+            avg_minutes_played_cutoff=avg_minutes_played_cutoff,
+        )
+
     def get_train_for_all_playoff_games(
         self, injury_adjusted: bool, avg_minutes_played_cutoff: int
     ):
         """Return dataframe of all adjusted features and game outcomes for this year."""
-        features = []
-        for _, row in self.playoff_game_data.iterrows():
-            feature = self.get_features_for_game(
-                game_id=row.GAME_ID,
-                injury_adjusted=injury_adjusted,
+        return self.get_train_for_all_playoff_games_by_cutoff(
+            injury_adjusted=injury_adjusted,
+            avg_minutes_played_cutoffs=[avg_minutes_played_cutoff],
+        )[avg_minutes_played_cutoff]
+
+    def get_train_for_all_playoff_games_by_cutoff(
+        self, injury_adjusted: bool, avg_minutes_played_cutoffs, game_ids=None
+    ):
+        """Return training dataframes for several minutes cutoffs keyed by cutoff.
+
+        The cutoff only filters players after injury reweighting, so the player
+        tables are built once and every cutoff is aggregated from them. Pass
+        game_ids to only build rows for those playoff games.
+        """
+        playoff_games = self.playoff_game_data[["GAME_ID", "TEAM_ID_H", "TEAM_ID_A", "OUTCOME"]]
+        if game_ids is not None:
+            playoff_games = playoff_games[playoff_games.GAME_ID.isin(game_ids)]
+        games = playoff_games.reset_index(drop=True).assign(GAMES_AHEAD=0)
+        player_tables = self.get_player_tables(
+            team_games=self.get_team_games(games),
+            injury_adjusted=injury_adjusted,
+        )
+        trainings = dict()
+        for avg_minutes_played_cutoff in avg_minutes_played_cutoffs:
+            features = self.aggregate_player_tables(
+                player_tables=player_tables,
+                games=games,
                 avg_minutes_played_cutoff=avg_minutes_played_cutoff,
             )
-            feature["HOME_WIN"] = row.OUTCOME
-            features.append(feature)
-        return pd.concat(features)
+            features["HOME_WIN"] = games.OUTCOME.values
+            trainings.update({avg_minutes_played_cutoff: features})
+        return trainings
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+import pandas as pd
+from objects.availability import playoff_availability
+
+
+class TestPlayoffAvailability(unittest.TestCase):
+
+    def setUp(self):
+        team_players = {1: [10, 11, 12], 2: [20, 21]}
+        played_boxes = pd.DataFrame({
+            "GAME_ID": ["004", "004", "004", "005", "005", "005"],
+            "TEAM_ID": [1, 1, 2, 1, 2, 2],
+            "PLAYER_ID": [10, 12, 21, 11, 20, 99],  # 99 is not on a roster
+        })
+        self.availability = playoff_availability(team_players, played_boxes)
+
+    def test_sat_out(self):
+        self.assertListEqual(self.availability.sat_out(1, "004").tolist(), [11])
+        self.assertListEqual(self.availability.sat_out(2, "004").tolist(), [20])
+        self.assertListEqual(self.availability.sat_out(1, "005").tolist(), [10, 12])
+        self.assertListEqual(self.availability.sat_out(2, "005").tolist(), [21])
+
+    def test_team_slices(self):
+        self.assertEqual(self.availability.played.shape, (2, 5))
+        self.assertListEqual(
+            self.availability.player_ids[self.availability.team_slices[2]].tolist(), [20, 21]
+        )
+
+    def test_missing_game(self):
+        with self.assertRaises(KeyError):
+            self.availability.sat_out(1, "006")
+        with self.assertRaises(KeyError):
+            self.availability.sat_out(3, "004")
+
+
+if __name__ == "__main__":
+    unittest.main()
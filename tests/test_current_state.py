@@ -5,6 +5,7 @@ import unittest
 from unittest.mock import patch
 from objects.current_state import current_state
 import pandas as pd
+import numpy as np
 class TestCurrentState(unittest.TestCase):
     def setUp(self):
 
@@ -38,6 +39,17 @@ class TestCurrentState(unittest.TestCase):
         prob = self.curr.predict_matchup(home_abb, away_abb)
         assert isinstance(prob, float)
 
+    def test_get_win_probability_matrix(self):
+        matrices = self.curr.get_win_probability_matrix(
+            games_ahead_of_today=[0, 1], team_abbs=["LAL", "MIA"]
+        )
+        self.assertEqual(set(matrices.keys()), {0, 1})
+        self.assertEqual(matrices[0].shape, (30, 30))
+        self.assertAlmostEqual(
+            matrices[0].at["LAL", "MIA"], self.curr.predict_matchup("LAL", "MIA"), places=6
+        )
+        self.assertTrue(np.isnan(matrices[0].at["LAL", "LAL"]))
+
 
 
 
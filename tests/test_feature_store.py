@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import tempfile
+import unittest
+import pandas as pd
+from objects.feature_store import feature_store
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = feature_store(schema_version=1, path=self.tmp.name)
+        self.features = pd.DataFrame({
+            "GAME_ID": ["0042200101", "0042200102"],
+            "mean_PTS_H": [10.5, 11.0],
+            "HOME_WIN": [1, 0],
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_and_get(self):
+        self.store.save(2022, True, 5, self.features)
+        stored = self.store.get(2022, True, 5, ["0042200102", "0042200101"])
+        self.assertListEqual(stored.GAME_ID.tolist(), ["0042200102", "0042200101"])
+        self.assertListEqual(stored.mean_PTS_H.tolist(), [11.0, 10.5])
+
+    def test_missing_game_ids(self):
+        self.store.save(2022, True, 5, self.features)
+        self.assertListEqual(
+            self.store.missing_game_ids(2022, True, 5, ["0042200101", "0042200103"]),
+            ["0042200103"])
+        self.assertEqual(
+            len(self.store.missing_game_ids(2022, False, 5, ["0042200101"])), 1)
+
+    def test_save_replaces_rows(self):
+        self.store.save(2022, True, 5, self.features)
+        update = self.features.iloc[[1]].assign(mean_PTS_H=20.0)
+        self.store.save(2022, True, 5, update)
+        stored = self.store.load(2022, True, 5)
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(stored.set_index("GAME_ID").mean_PTS_H["0042200102"], 20.0)
+
+    def test_schema_version_changes_shard(self):
+        self.assertNotEqual(
+            self.store.shard_path(2022, True, 5),
+            feature_store(schema_version=2, path=self.tmp.name).shard_path(2022, True, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+import numpy as np
+import pandas as pd
+from objects.features import (
+    FEATURE_COLUMNS,
+    FEATURE_STATS,
+    summarize_groups,
+    build_feature_frame,
+)
+
+
+class TestFeatures(unittest.TestCase):
+
+    def test_schema(self):
+        self.assertEqual(len(FEATURE_COLUMNS), 112)
+        self.assertEqual(FEATURE_COLUMNS[0], "mean_PTS_H")
+        self.assertEqual(FEATURE_COLUMNS[54:56], ["depth_at_cutoff_H", "home_win_percentage"])
+        self.assertEqual(FEATURE_COLUMNS[-1], "road_win_percentage")
+
+    def test_summaries_match_pandas(self):
+        rng = np.random.default_rng(0)
+        stats = rng.random((9, len(FEATURE_STATS)))
+        stats[2, 3] = np.nan
+        group_ids = np.array([1, 0, 1, 1, 2, 0, 2, 1, 0])
+        summaries, sizes = summarize_groups(group_ids, stats, 3)
+        grouped = pd.DataFrame(stats).groupby(group_ids)
+        expected = pd.concat(
+            [grouped.mean(), grouped.median(), grouped.max()], axis=1
+        ).to_numpy()
+        np.testing.assert_allclose(summaries, expected)
+        self.assertListEqual(sizes.tolist(), [3, 4, 2])
+
+    def test_missing_side(self):
+        summaries, sizes = summarize_groups(
+            np.array([0, 0]), np.ones((2, len(FEATURE_STATS))), 1
+        )
+        features = build_feature_frame(
+            summaries, sizes, home_groups=np.array([0]), away_groups=np.array([-1]),
+            home_win=np.array([0.5]), road_win=np.array([0.25]),
+        )
+        self.assertListEqual(list(features.columns), FEATURE_COLUMNS)
+        self.assertEqual(features.mean_PTS_H[0], 1)
+        self.assertEqual(features.depth_at_cutoff_H[0], 2)
+        self.assertEqual(features.depth_at_cutoff_A[0], 0)
+        self.assertTrue(np.isnan(features.max_PF_A[0]))
+        self.assertEqual(features.road_win_percentage[0], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
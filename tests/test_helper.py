@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 # @Project:final project
 
+import os
+import tempfile
 import unittest
 import datetime
+from unittest.mock import patch
 import pandas as pd
-from objects.helper import scrape_current_nba_injuries, scrape_nba_playoff_projections
+from objects.helper import scrape_current_nba_injuries, injury_report
 
 class TestMyModule(unittest.TestCase):
     def test_scrape_current_nba_injuries(self):
@@ -18,23 +21,26 @@ class TestMyModule(unittest.TestCase):
         expected_date = datetime.datetime.now() + datetime.timedelta(days=20)
         self.assertTrue(all(injuries["EXPECTED_WHEN_BACK"] > expected_date))
 
-    def test_scrape_nba_playoff_projections(self):
-        projections = scrape_nba_playoff_projections()
-        self.assertIsInstance(projections, dict)
-        self.assertIn("West", projections.keys())
-        self.assertIn("East", projections.keys())
-
-        west_data = projections["West"]
-        self.assertIsInstance(west_data, pd.DataFrame)
-        self.assertTrue(all(west_data.columns == ["TEAM_NAME", "1_SEED_PROB", "2_SEED_PROB", "3_SEED_PROB", "4_SEED_PROB", "5_SEED_PROB", "6_SEED_PROB", "7_SEED_PROB", "8_SEED_PROB", "TEAM_ID"]))
-        self.assertFalse(west_data.isnull().values.any())
-        self.assertGreater(len(west_data), 0)
-
-        east_data = projections["East"]
-        self.assertIsInstance(east_data, pd.DataFrame)
-        self.assertTrue(all(east_data.columns == ["TEAM_NAME", "1_SEED_PROB", "2_SEED_PROB", "3_SEED_PROB", "4_SEED_PROB", "5_SEED_PROB", "6_SEED_PROB", "7_SEED_PROB", "8_SEED_PROB", "TEAM_ID"]))
-        self.assertFalse(east_data.isnull().values.any())
-        self.assertGreater(len(east_data), 0)
+    def test_injury_report_scrapes_once_per_ttl(self):
+        now = datetime.datetime.now()
+        injuries = pd.DataFrame({
+            "PLAYER_NAME": ["A", "B", "C"],
+            "EXPECTED_WHEN_BACK": [now + datetime.timedelta(days=1),
+                                   now + datetime.timedelta(days=30),
+                                   now + datetime.timedelta(days=30)],
+            "PLAYER_ID": [1.0, 2.0, None],
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "injury_report.pickle")
+            with patch("objects.helper.fetch_current_nba_injuries", return_value=injuries) as fetch:
+                report = injury_report(ttl_seconds=3600, path=path)
+                self.assertEqual(len(report.out_for_game(0)), 2)
+                self.assertEqual(len(report.out_for_game(5)), 1)
+                self.assertEqual(fetch.call_count, 1)
+                injury_report(ttl_seconds=3600, path=path).out_for_game(0)
+                self.assertEqual(fetch.call_count, 1)
+                injury_report(ttl_seconds=0, path=path).out_for_game(0)
+                self.assertEqual(fetch.call_count, 2)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+from unittest.mock import patch, MagicMock
+import requests
+from objects.request_scheduler import request_scheduler
+
+
+def fake_endpoint(side_effect):
+    """Build an nba_api style endpoint class that fails or answers in order."""
+    endpoint = MagicMock(side_effect=side_effect)
+    endpoint.__name__ = "FakeEndpoint"
+    return endpoint
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def test_no_wait_while_bucket_has_tokens(self):
+        scheduler = request_scheduler(max_rate=1, capacity=3)
+        with patch("objects.request_scheduler.time.sleep") as sleep:
+            for _ in range(3):
+                scheduler.wait()
+        sleep.assert_not_called()
+
+    def test_wait_when_bucket_empty(self):
+        scheduler = request_scheduler(max_rate=1, capacity=1)
+        scheduler.wait()
+        with patch("objects.request_scheduler.time.sleep",
+                   side_effect=lambda seconds: setattr(scheduler, "tokens", 1)) as sleep:
+            scheduler.wait()
+        self.assertGreater(sleep.call_args.args[0], 0)
+
+    def test_call_retries_throttled_requests(self):
+        answer = MagicMock()
+        answer.get_data_frames.return_value = ["frame"]
+        endpoint = fake_endpoint([requests.exceptions.ReadTimeout(), answer])
+        scheduler = request_scheduler(max_rate=2, backoff_seconds=1)
+        with patch("objects.request_scheduler.time.sleep") as sleep:
+            self.assertEqual(scheduler.call(endpoint, season="2022-23"), ["frame"])
+        endpoint.assert_called_with(season="2022-23")
+        self.assertIn(1, [call.args[0] for call in sleep.call_args_list])
+        self.assertLess(scheduler.rate, 2)
+        report = scheduler.report()
+        self.assertEqual(report.loc["FakeEndpoint", "calls"], 1)
+        self.assertEqual(report.loc["FakeEndpoint", "retries"], 1)
+
+    def test_call_gives_up(self):
+        endpoint = fake_endpoint(requests.exceptions.ConnectionError())
+        scheduler = request_scheduler(retries=2, backoff_seconds=1)
+        with patch("objects.request_scheduler.time.sleep"):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                scheduler.call(endpoint)
+        self.assertEqual(endpoint.call_count, 3)
+        self.assertEqual(scheduler.report().loc["FakeEndpoint", "failures"], 1)
+
+    def test_call_does_not_retry_other_errors(self):
+        endpoint = fake_endpoint(ValueError("bad frame"))
+        scheduler = request_scheduler(max_rate=2, backoff_seconds=1)
+        with patch("objects.request_scheduler.time.sleep") as sleep:
+            with self.assertRaises(ValueError):
+                scheduler.call(endpoint)
+        self.assertEqual(endpoint.call_count, 1)
+        sleep.assert_not_called()
+        self.assertEqual(scheduler.rate, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+import numpy as np
+import pandas as pd
+from objects.season_simulator import season_simulator
+
+
+def round_robin(team_ids, home_wins):
+    """Build one game between every pair of teams, won by the better team if home_wins."""
+    games = [
+        (team_ids[better], team_ids[worse], int(home_wins))
+        for better in range(len(team_ids))
+        for worse in range(better + 1, len(team_ids))
+    ]
+    return pd.DataFrame(games, columns=["TEAM_ID_H", "TEAM_ID_A", "OUTCOME"])
+
+
+class TestSeasonSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.team_ids = list(range(100, 130))
+        self.conferences = np.array(["EAST"] * 15 + ["WEST"] * 15)
+        east, west = self.team_ids[:15], self.team_ids[15:]
+        # lower ids beat higher ids, so standings follow team order
+        self.played = pd.concat([round_robin(east, True), round_robin(west, True)])
+        self.no_games = pd.DataFrame(columns=["TEAM_ID_H", "TEAM_ID_A"])
+        self.coin_flips = np.full((30, 30), 0.5)
+
+    def simulator(self, played=None, remaining=None, home_win_probs=None):
+        return season_simulator(
+            self.team_ids,
+            self.conferences,
+            self.played if played is None else played,
+            self.no_games if remaining is None else remaining,
+            self.coin_flips if home_win_probs is None else home_win_probs,
+        )
+
+    def test_finished_season(self):
+        home_always_wins = np.ones((30, 30))
+        seeds = self.simulator().simulate(
+            num_seasons=200, seed=0, play_in_probs=home_always_wins
+        )
+        self.assertEqual(seeds.at[100, "1_SEED"], 200)
+        self.assertEqual(seeds.at[120, "6_SEED"], 200)
+        self.assertEqual(seeds.at[106, "7_SEED"], 200)
+        # 8 loses at 7 then hosts 9, who beat 10
+        self.assertEqual(seeds.at[107, "8_SEED"], 200)
+        self.assertEqual(seeds.loc[108:114].values.sum(), 0)
+
+    def test_play_in(self):
+        seeds = self.simulator().simulate(num_seasons=8000, seed=1)
+        self.assertListEqual(seeds.sum().tolist(), [16000] * 8)
+        self.assertEqual(seeds.loc[100:105, "7_SEED"].sum(), 0)
+        self.assertAlmostEqual(seeds.at[106, "7_SEED"] / 8000, 0.5, delta=0.03)
+        # 10 has to win two coin flips to get the 8 seed
+        self.assertAlmostEqual(seeds.at[109, "8_SEED"] / 8000, 0.25, delta=0.03)
+        self.assertEqual(seeds.loc[110:114].values.sum(), 0)
+
+    def test_head_to_head_tiebreak(self):
+        # 102 beats 101 but loses to 110, leaving them tied with 102 ahead head to head
+        played = self.played.copy()
+        for home, away in [(101, 102), (102, 110)]:
+            played.loc[(played.TEAM_ID_H == home) & (played.TEAM_ID_A == away), "OUTCOME"] = 0
+        seeds = self.simulator(played=played).simulate(num_seasons=50, seed=2)
+        self.assertEqual(seeds.at[102, "2_SEED"], 50)
+        self.assertEqual(seeds.at[101, "3_SEED"], 50)
+
+    def test_official_ranks(self):
+        # 101 and 102 swap ranks, as if a tie had been broken another way
+        ranks = np.tile(np.arange(1, 16), 2)
+        ranks[[1, 2]] = [3, 2]
+        seeds = self.simulator().simulate(
+            num_seasons=20, seed=5, play_in_probs=np.ones((30, 30)), ranks=ranks
+        )
+        self.assertEqual(seeds.at[102, "2_SEED"], 20)
+        self.assertEqual(seeds.at[101, "3_SEED"], 20)
+        self.assertEqual(seeds.at[106, "7_SEED"], 20)
+        self.assertEqual(seeds.at[115, "1_SEED"], 20)
+
+    def test_remaining_games(self):
+        # 114 goes from 0-14 to 28-14 by winning two more home games against each team
+        east = self.team_ids[:15]
+        remaining = pd.DataFrame(
+            {"TEAM_ID_H": [114] * 14 * 2, "TEAM_ID_A": east[:14] * 2}
+        )
+        home_win_probs = np.ones((30, 30))
+        first = self.simulator(remaining=remaining, home_win_probs=home_win_probs).simulate(
+            num_seasons=100, seed=3
+        )
+        self.assertEqual(first.at[114, "5_SEED"], 100)
+        self.assertEqual(first.at[104, "6_SEED"], 100)
+        second = self.simulator(remaining=remaining).simulate(num_seasons=300, seed=4)
+        self.assertTrue(
+            second.equals(self.simulator(remaining=remaining).simulate(num_seasons=300, seed=4))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import datetime
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from objects.season_store import season_store
+from objects.year import year
+
+
+class TestSeasonStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = season_store(path=self.tmp.name)
+        self.frame = pd.DataFrame({"GAME_ID": ["001", "002"], "PTS_H": [100, 90]})
+        self.timestamp = datetime.datetime(2023, 4, 20, 12, 30)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_dataset(self):
+        self.assertIsNone(self.store.load("2022-23", "game_data"))
+        self.assertIsNone(self.store.update_timestamp("2022-23", "game_data"))
+
+    def test_save_and_load(self):
+        self.store.save("2022-23", "game_data", self.frame, self.timestamp)
+        self.store.save("2022-23", "playoff_boxes", self.frame.head(1), self.timestamp)
+        pd.testing.assert_frame_equal(self.store.load("2022-23", "game_data"), self.frame)
+        self.assertEqual(self.store.update_timestamp("2022-23", "game_data"), self.timestamp)
+        self.assertListEqual(sorted(self.store.manifest("2022-23")),
+                             ["game_data", "playoff_boxes"])
+
+    def test_year_reads_only_tables_it_uses(self):
+        self.store.save("2018-19", "game_data", self.frame, self.timestamp)
+        with patch("objects.year.nba_requests.call", side_effect=AssertionError):
+            this_year = year(2018, store=self.store, lazy=True)
+            pd.testing.assert_frame_equal(this_year.game_data, self.frame)
+        self.assertEqual(this_year.update_timestamp_game_data, self.timestamp)
+        self.assertTrue(this_year.playoff_boxes_cache.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
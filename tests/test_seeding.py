@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+import numpy as np
+from objects.seeding import seeding_sampler, SEED_LABELS
+
+
+def seed_table(conference, probs):
+    """Build get_playoff_picture_liklihood style probabilities for one conference."""
+    return {
+        f"{conference[0]}{team}": {
+            f"{seed + 1}_{conference}": probs[team][seed] for seed in range(8)
+        }
+        for team in range(len(probs))
+    }
+
+
+class TestSeedingSampler(unittest.TestCase):
+
+    def setUp(self):
+        east = np.zeros((10, 8))
+        east[:8, :8] = np.eye(8) * 60
+        east[1:9, :8] += np.eye(8) * 40  # every seed is a two team race
+        west = np.full((9, 8), np.nan)
+        west[:8] = np.eye(8) * 100  # the west is decided
+        self.sampler = seeding_sampler(
+            {**seed_table("EAST", east), **seed_table("WEST", west)}
+        )
+
+    def test_consistent_seedings(self):
+        seedings = self.sampler.sample(num_scenarios=2000, seed=0)
+        self.assertEqual(seedings.shape, (2000, 16))
+        for seeding in seedings:
+            self.assertEqual(len(set(seeding)), 16)
+        team_abbs = np.array(self.sampler.team_abbs)
+        self.assertTrue(all(abb[0] == "E" for abb in team_abbs[seedings[:, :8]].ravel()))
+        self.assertListEqual(
+            team_abbs[seedings[0, 8:]].tolist(), [f"W{team}" for team in range(8)]
+        )
+        # teams without a chance to make it are not seeded
+        self.assertNotIn("W8", self.sampler.team_abbs)
+
+    def test_seed_frequencies(self):
+        seedings = self.sampler.sample(num_scenarios=4000, seed=1)
+        team_abbs = np.array(self.sampler.team_abbs)
+        self.assertAlmostEqual(np.mean(team_abbs[seedings[:, 0]] == "E0"), 0.6, delta=0.03)
+        self.assertTrue(np.array_equal(seedings, self.sampler.sample(num_scenarios=4000, seed=1)))
+
+    def test_scenarios(self):
+        scenarios, weights = self.sampler.scenarios(num_scenarios=3000, seed=2)
+        self.assertAlmostEqual(weights.sum(), 1)
+        self.assertEqual(len(np.unique(scenarios, axis=0)), len(scenarios))
+
+    def test_most_likely_seeding(self):
+        # the greedy choice gives E0 the 1 seed, but E1 at 1 and E0 at 2 is more likely
+        sampler = seeding_sampler(
+            {
+                **seed_table("EAST", np.vstack([[50, 50] + [0] * 6, [49, 0] + [0] * 6, np.eye(8)[2:] * 100])),
+                **seed_table("WEST", np.eye(8) * 100),
+            }
+        )
+        seeding = np.array(sampler.team_abbs)[sampler.most_likely_seeding()]
+        self.assertListEqual(seeding[:3].tolist(), ["E1", "E0", "E2"])
+        self.assertEqual(len(SEED_LABELS), len(seeding))
+
+
+if __name__ == "__main__":
+    unittest.main()
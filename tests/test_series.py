@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import itertools
+import unittest
+import numpy as np
+from objects.series import series_outcome_probabilities, possible_series_lengths
+
+
+def enumerate_series(probs, higher_already_won, lower_already_won):
+    """Brute force series length distribution by enumerating every game outcome."""
+    higher, lower = np.zeros(4), np.zeros(4)
+    start = higher_already_won + lower_already_won
+    for outcome in itertools.product([0, 1], repeat=7 - start):
+        higher_wins, lower_wins, prob = higher_already_won, lower_already_won, 1.0
+        for game, won in enumerate(outcome, start=start):
+            prob *= probs[game] if won else 1 - probs[game]
+            higher_wins += won
+            lower_wins += 1 - won
+            if (higher_wins == 4) or (lower_wins == 4):
+                break
+        # count each finished series once, through its all-zero remainder
+        if any(outcome[game - start + 1:]):
+            continue
+        if higher_wins == 4:
+            higher[game - 3] += prob
+        else:
+            lower[game - 3] += prob
+    return higher, lower
+
+
+class TestSeries(unittest.TestCase):
+
+    def test_matches_enumeration(self):
+        rng = np.random.default_rng(821)
+        for higher_already_won, lower_already_won in itertools.product(range(4), range(4)):
+            probs = rng.random(7)
+            higher, lower = series_outcome_probabilities(
+                probs, higher_already_won, lower_already_won
+            )
+            expected_higher, expected_lower = enumerate_series(
+                probs, higher_already_won, lower_already_won
+            )
+            np.testing.assert_allclose(higher, expected_higher, atol=1e-12)
+            np.testing.assert_allclose(lower, expected_lower, atol=1e-12)
+            self.assertAlmostEqual(higher.sum() + lower.sum(), 1)
+
+    def test_batched_probabilities(self):
+        probs = np.random.default_rng(1).random((7, 3, 2))
+        higher, lower = series_outcome_probabilities(probs, 1, 2)
+        self.assertEqual(higher.shape, (4, 3, 2))
+        single_higher, _ = series_outcome_probabilities(probs[:, 2, 1], 1, 2)
+        np.testing.assert_allclose(higher[:, 2, 1], single_higher)
+
+    def test_possible_series_lengths(self):
+        self.assertEqual(possible_series_lengths(0, 0), ([4, 5, 6, 7], [4, 5, 6, 7]))
+        self.assertEqual(possible_series_lengths(2, 1), ([5, 6, 7], [6, 7]))
+        self.assertEqual(possible_series_lengths(3, 3), ([7], [7]))
+
+    def test_too_many_wins(self):
+        with self.assertRaises(KeyError):
+            series_outcome_probabilities(np.full(7, 0.5), 5, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
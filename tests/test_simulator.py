@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import unittest
+import numpy as np
+from objects.series import series_outcome_probabilities
+from objects.simulator import bracket_simulator, bracket_propagation
+
+
+def playoff_script():
+    """Build the bracket script current_state uses."""
+    script = {"R1": []}
+    for conference in ["EAST", "WEST"]:
+        script["R1"] += [
+            (f"{higher}_{conference}", f"{9 - higher}_{conference}")
+            for higher in [1, 2, 3, 4]
+        ]
+    winners = ["_".join(matchup) for matchup in script["R1"]]
+    order = [0, 3, 1, 2, 4, 7, 5, 6]
+    winners = [winners[i] for i in order]
+    for round_str in ["R2", "R3", "R4"]:
+        script[round_str] = list(zip(winners[::2], winners[1::2]))
+        winners = ["_".join(matchup) for matchup in script[round_str]]
+    return script
+
+
+class TestBracketSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.script = playoff_script()
+        self.seeds = {
+            f"{seed}_{conference}": f"{conference[0]}{seed}"
+            for conference in ["EAST", "WEST"]
+            for seed in range(1, 9)
+        }
+        rng = np.random.default_rng(0)
+        self.series_probs = rng.uniform(0.3, 0.7, size=(7, 16, 16))
+        self.records = np.linspace(0.7, 0.4, 16)
+
+    def simulator(self, series_probs=None, series_state=None):
+        return bracket_simulator(
+            self.script,
+            self.seeds,
+            self.series_probs if series_probs is None else series_probs,
+            self.records,
+            series_state,
+        )
+
+    def test_script(self):
+        self.assertEqual(self.script["R2"][0], ("1_EAST_8_EAST", "4_EAST_5_EAST"))
+        self.assertEqual(len(self.script["R4"]), 1)
+
+    def test_reproducible(self):
+        first = self.simulator().simulate(num_trials=2000, seed=7)
+        second = self.simulator().simulate(num_trials=2000, seed=7)
+        self.assertTrue(first["round_reach"].equals(second["round_reach"]))
+        self.assertTrue(first["series_lengths"].equals(second["series_lengths"]))
+        self.assertEqual(first["round_reach"].R4.sum(), 2000)
+        self.assertEqual(first["series_lengths"].sum().sum(), 2000 * 15 * 2)
+
+    def test_favourites_always_win(self):
+        # the higher seed wins every game, so the 1 seed with the better record wins it all
+        results = self.simulator(series_probs=np.ones((7, 16, 16))).simulate(
+            num_trials=100, seed=0
+        )
+        self.assertEqual(results["round_reach"].at["E1", "R4"], 100)
+        self.assertEqual(results["round_reach"].at["W1", "R3"], 100)
+        self.assertEqual(results["round_reach"].at["E8", "R1"], 0)
+        self.assertEqual(results["series_lengths"].at[("W1", "R4"), "LOST_IN_4"], 100)
+
+    def test_in_progress_series(self):
+        series_state = {
+            "R0": dict(),
+            "R1": {"1_EAST_8_EAST": {"E1": 1, "E8": 4}, "2_EAST_7_EAST": {"E2": 0, "E7": 3}},
+        }
+        results = self.simulator(
+            series_probs=np.full((7, 16, 16), 0.5), series_state=series_state
+        ).simulate(num_trials=4000, seed=1)
+        self.assertEqual(results["round_reach"].at["E8", "R1"], 4000)
+        self.assertEqual(results["series_lengths"].at[("E8", "R1"), "WON_IN_5"], 4000)
+        # E2 has to win four straight coin flips
+        self.assertAlmostEqual(results["round_reach"].at["E2", "R1"] / 4000, 1 / 16, delta=0.015)
+
+    def test_matches_series_probabilities(self):
+        results = self.simulator().simulate(num_trials=40000, seed=3)
+        higher_wins_in, _ = series_outcome_probabilities(self.series_probs[:, 0, 7])
+        self.assertAlmostEqual(
+            results["round_reach"].at["E1", "R1"] / 40000, higher_wins_in.sum(), delta=0.01
+        )
+        self.assertAlmostEqual(
+            results["series_lengths"].at[("E1", "R1"), "WON_IN_6"] / 40000,
+            higher_wins_in[2],
+            delta=0.01,
+        )
+
+    def test_parallel_reproducible(self):
+        first = self.simulator().simulate_parallel(num_trials=3001, seed=11, num_workers=2)
+        second = self.simulator().simulate_parallel(num_trials=3001, seed=11, num_workers=2)
+        self.assertEqual(first["trials"], 3001)
+        self.assertEqual(first["round_reach"].R1.sum(), 3001 * 8)
+        self.assertTrue(first["round_reach"].equals(second["round_reach"]))
+        self.assertTrue(first["series_lengths"].equals(second["series_lengths"]))
+        other = self.simulator().simulate_parallel(num_trials=3001, seed=12, num_workers=2)
+        self.assertFalse(first["round_reach"].equals(other["round_reach"]))
+
+
+class TestBracketPropagation(unittest.TestCase):
+
+    def setUp(self):
+        self.script = playoff_script()
+        self.seeds = {
+            f"{seed}_{conference}": f"{conference[0]}{seed}"
+            for conference in ["EAST", "WEST"]
+            for seed in range(1, 9)
+        }
+        # home court does not matter: each team beats another with the same probability
+        strength = np.linspace(2, 0.5, 16)
+        game_probs = strength[:, None] / (strength[:, None] + strength[None, :])
+        self.series_probs = np.repeat(game_probs[None], 7, axis=0)
+        self.records = np.linspace(0.7, 0.4, 16)
+
+    def propagate(self, series_state=None):
+        return bracket_propagation(
+            self.script, self.seeds, self.series_probs, self.records, series_state
+        ).propagate()
+
+    def test_round_totals(self):
+        round_reach = self.propagate()["round_reach"]
+        np.testing.assert_allclose(round_reach.sum().to_numpy(), [8, 4, 2, 1])
+        higher_wins_in, _ = series_outcome_probabilities(self.series_probs[:, 2, 5])
+        self.assertAlmostEqual(round_reach.at["E3", "R1"], higher_wins_in.sum())
+
+    def test_matches_simulation(self):
+        round_reach = self.propagate()["round_reach"]
+        simulated = bracket_simulator(
+            self.script, self.seeds, self.series_probs, self.records
+        ).simulate(num_trials=50000, seed=5)
+        np.testing.assert_allclose(
+            simulated["round_reach"].to_numpy() / 50000, round_reach.to_numpy(), atol=0.01
+        )
+
+    def test_in_progress_series(self):
+        series_state = {
+            "R0": dict(),
+            "R1": {"1_EAST_8_EAST": {"E1": 1, "E8": 4}, "2_EAST_7_EAST": {"E2": 0, "E7": 3}},
+        }
+        bracket = self.propagate(series_state)
+        self.assertEqual(bracket["round_reach"].at["E8", "R1"], 1)
+        self.assertEqual(bracket["round_reach"].at["E1", "R2"], 0)
+        higher_wins_in, _ = series_outcome_probabilities(
+            self.series_probs[:, 1, 6], higher_already_won=0, lower_already_won=3
+        )
+        self.assertAlmostEqual(bracket["round_reach"].at["E2", "R1"], higher_wins_in.sum())
+        self.assertListEqual(
+            [series[1:] for series in bracket["series"]["R1"]], [(0, 7, 1, 4), (1, 6, 0, 3)]
+        )
+
+    def test_home_court_rules_match_simulation(self):
+        # the series probabilities depend on who is the higher seed
+        series_probs = np.random.default_rng(4).uniform(0.2, 0.8, size=(7, 16, 16))
+        for home_court in ["slot", "seed"]:
+            round_reach = bracket_propagation(
+                self.script, self.seeds, series_probs, self.records, home_court=home_court
+            ).propagate()["round_reach"]
+            simulated = bracket_simulator(
+                self.script, self.seeds, series_probs, self.records, home_court=home_court
+            ).simulate(num_trials=50000, seed=6)
+            np.testing.assert_allclose(
+                simulated["round_reach"].to_numpy() / 50000, round_reach.to_numpy(), atol=0.01
+            )
+
+    def test_home_court_rules(self):
+        # the higher seed wins every game and E8 already beat E1
+        series_state = {"R0": dict(), "R1": {"1_EAST_8_EAST": {"E1": 0, "E8": 4}}}
+        for home_court, r2_winner in [("slot", "E8"), ("seed", "E4")]:
+            round_reach = bracket_propagation(
+                self.script, self.seeds, np.ones((7, 16, 16)), self.records,
+                series_state, home_court=home_court,
+            ).propagate()["round_reach"]
+            self.assertEqual(round_reach.at[r2_winner, "R2"], 1)
+            simulated = bracket_simulator(
+                self.script, self.seeds, np.ones((7, 16, 16)), self.records,
+                series_state, home_court=home_court,
+            ).simulate(num_trials=100, seed=0)
+            self.assertEqual(simulated["round_reach"].at[r2_winner, "R2"], 100)
+        with self.assertRaises(ValueError):
+            bracket_simulator(self.script, self.seeds, self.series_probs, self.records,
+                              home_court="record")
+
+    def test_finals_home_court_by_record(self):
+        # the higher seed wins every game, so the finalist with the better record wins
+        bracket = bracket_propagation(
+            self.script, self.seeds, np.ones((7, 16, 16)), self.records[::-1]
+        ).propagate()
+        self.assertEqual(bracket["round_reach"].at["W1", "R4"], 1)
+        self.assertEqual(bracket["round_reach"].at["E1", "R4"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
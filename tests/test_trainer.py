@@ -21,3 +21,20 @@ class TestTrainingDataset(unittest.TestCase):
     def test_load_train_data(self):
         self.ds.load_train_data(injury_adjusted=True, avg_minutes_played_cutoff=20)
         self.assertEqual(len(self.ds.training_sets_cache), len(range(2020, 2021)))
+
+
+class TestLoadSeason(unittest.TestCase):
+
+    def test_load_season_retries_with_backoff(self):
+        ds = training_dataset.__new__(training_dataset)
+        with patch("objects.trainer.year", side_effect=[ConnectionError(), ConnectionError(), "season"]), \
+                patch("objects.trainer.time.sleep") as sleep:
+            self.assertEqual(ds.load_season(2020, retries=3, backoff_seconds=1), "season")
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2])
+
+    def test_load_season_gives_up(self):
+        ds = training_dataset.__new__(training_dataset)
+        with patch("objects.trainer.year", side_effect=ConnectionError()), \
+                patch("objects.trainer.time.sleep"):
+            with self.assertRaises(ConnectionError):
+                ds.load_season(2020, retries=1, backoff_seconds=1)
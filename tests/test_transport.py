@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# @Project:final project
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from objects.request_scheduler import request_scheduler
+from objects.transport import transport
+
+
+def fake_endpoint(frames):
+    """Build an nba_api style endpoint class answering with the given frames."""
+    answer = MagicMock()
+    answer.get_data_frames.return_value = frames
+    endpoint = MagicMock(return_value=answer)
+    endpoint.__name__ = "FakeEndpoint"
+    return endpoint
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "archive.pickle.gz")
+        patcher = patch("objects.transport.atexit.register")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_then_replay(self):
+        recorder = transport("record", self.path)
+        endpoint = fake_endpoint(["frame"])
+        self.assertEqual(recorder.nba_api(endpoint, season="2022-23"), ["frame"])
+        with patch("objects.transport.requests.get") as get:
+            get.return_value.text = "<html></html>"
+            self.assertEqual(recorder.get_text("https://example.com"), "<html></html>")
+        recorder.save()
+
+        replayer = transport("replay", self.path)
+        with patch("objects.transport.requests.get") as get:
+            self.assertEqual(replayer.nba_api(endpoint, season="2022-23"), ["frame"])
+            self.assertEqual(replayer.get_text("https://example.com"), "<html></html>")
+        get.assert_not_called()
+        self.assertEqual(endpoint.call_count, 1)
+
+    def test_replay_missing_request(self):
+        replayer = transport("replay", self.path)
+        with self.assertRaises(KeyError):
+            replayer.nba_api(fake_endpoint(["frame"]), season="2022-23")
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            transport("offline", self.path)
+
+    def test_scheduler_replay_skips_network(self):
+        recorder = transport("record", self.path)
+        recorder.nba_api(fake_endpoint(["frame"]), season="2022-23")
+        recorder.save()
+        endpoint = fake_endpoint(["other"])
+        scheduler = request_scheduler(max_rate=1, capacity=1)
+        with patch("objects.request_scheduler.nba_transport", transport("replay", self.path)):
+            for _ in range(3):
+                self.assertEqual(scheduler.call(endpoint, season="2022-23"), ["frame"])
+        endpoint.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
-from unittest.mock import patch, MagicMock
-from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock, PropertyMock
+from datetime import datetime
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from objects.year import year
 from nba_api.stats.library.parameters import SeasonType, SeasonTypePlayoffs
@@ -211,5 +213,362 @@ class TestYear(unittest.TestCase):
         self.assertTrue(train_data.shape[0] > 0)
         self.assertEqual(len(train_data), self.year.playoff_game_data.shape[0])
 
+
+BOX_STATS = ["PTS", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA",
+             "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PLUS_MINUS"]
+
+
+def fixture_season():
+    """Build an offline 2018 season of four teams with a few playoff games."""
+    rng = np.random.default_rng(0)
+    teams = {1610612738: "BOS", 1610612748: "MIA", 1610612752: "NYK", 1610612755: "PHI"}
+    positions = ["G", "G-F", "F", "F-C", "C", "F", "G", "F", "C"]
+    minutes = np.array([36, 33, 30, 27, 22, 18, 12, 8, 4], dtype=float)
+    roster = pd.DataFrame([
+        (team_id, team_id % 1000 * 10 + player, positions[player])
+        for team_id in teams for player in range(len(positions))
+    ], columns=["TEAM_ID", "PLAYER_ID", "POSITION"])
+
+    def games(matchups, prefix, month):
+        rows = []
+        for num, (home, away) in enumerate(matchups):
+            points = rng.integers(90, 120, 2)
+            for team_id, matchup, pts, opp in [
+                    (home, f"{teams[home]} vs. {teams[away]}", points[0], points[1]),
+                    (away, f"{teams[away]} @ {teams[home]}", points[1], points[0])]:
+                row = {"GAME_ID": f"{prefix}{num:05d}", "GAME_DATE": f"2019-{month}-{num + 1:02d}",
+                       "MATCHUP": matchup, "TEAM_ID": team_id, "TEAM_ABBREVIATION": teams[team_id],
+                       "WL": "W" if pts > opp else "L"}
+                row.update({stat: rng.uniform(1, 40) for stat in BOX_STATS})
+                row.update(PTS=pts, PLUS_MINUS=pts - opp)
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+    def boxes(game_rows, sitting=()):
+        rows = []
+        for game in game_rows.itertuples():
+            players = roster[(roster.TEAM_ID == game.TEAM_ID) & ~roster.PLAYER_ID.isin(sitting)]
+            for player_id in players.PLAYER_ID:
+                row = {"GAME_ID": game.GAME_ID, "GAME_DATE": game.GAME_DATE, "TEAM_ID": game.TEAM_ID,
+                       "PLAYER_ID": player_id,
+                       "MIN": minutes[player_id % 10] + rng.uniform(-2, 2)}
+                row.update({stat: rng.uniform(0, 10) for stat in BOX_STATS})
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+    pairs = [(home, away) for home in teams for away in teams if home != away]
+    regular = games(pairs, "00218", "01")
+    playoffs = games([(1610612738, 1610612748), (1610612748, 1610612738),
+                      (1610612752, 1610612755)], "00418", "04")
+    this_year = year(2018, lazy=True)
+    this_year.roster_info_cache = roster
+    this_year.game_data_cache = year.pivot_games(regular)
+    this_year.regular_boxes_cache = boxes(regular)
+    this_year.playoff_game_data_cache = year.pivot_games(playoffs)
+    # each team's two best players sit out some playoff games
+    this_year.playoff_boxes_cache = this_year.rank_playoff_boxes(pd.concat([
+        boxes(playoffs.iloc[:2], sitting=[7380, 7480, 7481]),
+        boxes(playoffs.iloc[2:4]),
+        boxes(playoffs.iloc[4:], sitting=[7520, 7550, 7551])]))
+    return this_year
+
+
+class TestFeatureBatching(unittest.TestCase):
+
+    def setUp(self):
+        self.year = fixture_season()
+        self.game_ids = self.year.playoff_game_data.GAME_ID.tolist()
+
+    def per_game_rows(self, injury_adjusted, avg_minutes_played_cutoff):
+        rows = pd.concat([
+            self.year.get_features_for_game(game_id, injury_adjusted, avg_minutes_played_cutoff)
+            for game_id in self.game_ids], ignore_index=True)
+        rows["HOME_WIN"] = self.year.playoff_game_data.OUTCOME.values
+        return rows
+
+    def test_batched_rows_match_per_game_rows(self):
+        for injury_adjusted in [True, False]:
+            train = self.year.get_train_for_all_playoff_games(injury_adjusted, 10)
+            self.assertEqual(len(train), len(self.game_ids))
+            pd.testing.assert_frame_equal(
+                train.reset_index(drop=True), self.per_game_rows(injury_adjusted, 10),
+                check_dtype=False, rtol=1e-6)
+        # injured starters change the adjusted features
+        adjusted = self.year.get_train_for_all_playoff_games(True, 10)
+        unadjusted = self.year.get_train_for_all_playoff_games(False, 10)
+        self.assertFalse(np.allclose(adjusted.iloc[0].to_numpy(dtype=float),
+                                     unadjusted.iloc[0].to_numpy(dtype=float), equal_nan=True))
+
+    def test_cutoff_batch_matches_single_cutoff(self):
+        for injury_adjusted in [True, False]:
+            by_cutoff = self.year.get_train_for_all_playoff_games_by_cutoff(injury_adjusted, [0, 10, 20])
+            self.assertListEqual(sorted(by_cutoff), [0, 10, 20])
+            for cutoff, train in by_cutoff.items():
+                pd.testing.assert_frame_equal(
+                    train.reset_index(drop=True),
+                    self.year.get_train_for_all_playoff_games(injury_adjusted, cutoff).reset_index(drop=True),
+                    check_dtype=False, rtol=1e-6)
+
+
+class TestRosterRefresh(unittest.TestCase):
+
+    BOS, MIA, NYK = 1610612738, 1610612748, 1610612752
+
+    def setUp(self):
+        # rosters the team endpoint answers with and the league wide player list
+        self.rosters = {self.BOS: [10, 11], self.MIA: [20], self.NYK: [30]}
+        self.listed = {self.BOS: [10, 11], self.MIA: [20], self.NYK: [30]}
+        self.this_year = year.__new__(year)
+        self.this_year.store = None
+        self.this_year.year, self.this_year.season = 2022, "2022-23"
+        self.this_year.regular_boxes_cache = pd.DataFrame({
+            "TEAM_ID": [self.BOS, self.BOS, self.MIA, self.NYK],
+            "PLAYER_ID": [10, 11, 20, 30],
+            "GAME_DATE": ["2022-12-01"] * 4})
+        self.this_year.roster_info_cache = pd.DataFrame()
+        self.this_year.roster_players_cache = dict()
+        self.this_year.update_timestamp_regular_boxes = datetime(2023, 1, 2)
+        self.this_year.update_timestamp_roster_info = datetime(2023, 1, 1)
+        self.assertEqual(self.load_rosters(datetime(2023, 1, 1)), [self.BOS, self.MIA, self.NYK])
+
+    def fake_call(self, endpoint, season, team_id=None, **kwargs):
+        if team_id is None:
+            return [pd.DataFrame(
+                [(player_id, team) for team, players in self.listed.items() for player_id in players],
+                columns=["PERSON_ID", "TEAM_ID"])]
+        return [pd.DataFrame({"TeamID": team_id, "PLAYER_ID": self.rosters[team_id],
+                              "POSITION": "G"})]
+
+    def load_rosters(self, now):
+        """Get roster info at now and the teams whose rosters were requested."""
+        with patch("objects.year.nba_requests.call", side_effect=self.fake_call) as call, \
+                patch.object(year, "playoff_game_data", new_callable=PropertyMock,
+                             return_value=pd.DataFrame()), \
+                patch("objects.year.datetime.datetime") as fake_datetime:
+            fake_datetime.now.return_value = now
+            self.this_year.roster_info
+        return sorted(
+            call_args.kwargs["team_id"] for call_args in call.call_args_list
+            if "team_id" in call_args.kwargs)
+
+    def players(self, team_id):
+        return sorted(self.this_year.roster_info_cache.query("TEAM_ID == @team_id").PLAYER_ID)
+
+    def test_unchanged_teams_are_not_requested(self):
+        self.this_year.regular_boxes_cache = pd.concat([
+            self.this_year.regular_boxes_cache,
+            pd.DataFrame({"TEAM_ID": [self.MIA], "PLAYER_ID": [20], "GAME_DATE": ["2022-12-02"]})])
+        self.assertListEqual(self.load_rosters(datetime(2023, 1, 2)), [])
+
+    def test_player_traded_while_injured(self):
+        # no box score shows the trade, only the league wide player list
+        for team in [self.rosters, self.listed]:
+            team[self.BOS].remove(11)
+            team[self.MIA].append(11)
+        self.assertListEqual(self.load_rosters(datetime(2023, 1, 2)), [self.BOS, self.MIA])
+        self.assertListEqual(self.players(self.BOS), [10])
+        self.assertListEqual(self.players(self.MIA), [11, 20])
+
+    def test_player_playing_for_another_team(self):
+        # the league wide player list still has him on his old team
+        self.rosters[self.BOS].remove(11)
+        self.rosters[self.NYK].append(11)
+        self.this_year.regular_boxes_cache = pd.concat([
+            self.this_year.regular_boxes_cache,
+            pd.DataFrame({"TEAM_ID": [self.NYK], "PLAYER_ID": [11], "GAME_DATE": ["2022-12-02"]})])
+        self.assertListEqual(self.load_rosters(datetime(2023, 1, 2)), [self.BOS, self.NYK])
+        self.assertListEqual(self.players(self.BOS), [10])
+        self.assertListEqual(self.players(self.NYK), [11, 30])
+
+
+class TestIncrementalIngest(unittest.TestCase):
+
+    @staticmethod
+    def long_games(game_id, game_date, home_pts, away_pts):
+        stats = ["FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA",
+                 "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF"]
+        rows = pd.DataFrame({
+            "GAME_ID": [game_id, game_id], "GAME_DATE": [game_date, game_date],
+            "MATCHUP": ["BOS vs. MIA", "MIA @ BOS"],
+            "TEAM_ID": [1610612738, 1610612748],
+            "TEAM_ABBREVIATION": ["BOS", "MIA"], "WL": ["W", "L"],
+            "PTS": [home_pts, away_pts],
+            "PLUS_MINUS": [home_pts - away_pts, away_pts - home_pts]})
+        for stat in stats:
+            rows[stat] = 1
+        return rows
+
+    def test_game_data_appends_games_since_newest_date(self):
+        this_year = year.__new__(year)
+        this_year.store = None
+        this_year.year, this_year.season = 2022, "2022-23"
+        this_year.game_data_cache = year.pivot_games(pd.concat([
+            self.long_games("001", "2023-01-01", 100, 90),
+            self.long_games("002", "2023-01-03", 95, 99)]))
+        this_year.update_timestamp_game_data = datetime(2023, 1, 3)
+        new_games = pd.concat([self.long_games("002", "2023-01-03", 101, 99),
+                               self.long_games("003", "2023-01-04", 80, 90)])
+        with patch("objects.year.nba_requests.call", return_value=[new_games]) as call, \
+                patch.object(year, "playoff_game_data", new_callable=PropertyMock,
+                             return_value=pd.DataFrame()), \
+                patch("objects.year.datetime.datetime") as fake_datetime:
+            fake_datetime.now.return_value = datetime(2023, 1, 5)
+            game_data = this_year.game_data
+        self.assertEqual(call.call_args.kwargs["date_from_nullable"], "01/03/2023")
+        self.assertListEqual(game_data.GAME_ID.tolist(), ["001", "002", "003"])
+        self.assertListEqual(game_data.PTS_H.tolist(), [100, 101, 80])
+        self.assertListEqual(game_data.OUTCOME.tolist(), [1, 1, 0])
+
+    @staticmethod
+    def player_boxes(game_id, game_date, minutes):
+        rows = pd.DataFrame({"GAME_ID": game_id, "GAME_DATE": game_date, "TEAM_ID": 1610612738,
+                             "PLAYER_ID": [10, 11], "MIN": minutes})
+        for stat in BOX_STATS:
+            rows[stat] = 1
+        return rows
+
+    def test_regular_boxes_summary_recomputed_after_append(self):
+        this_year = year(2022, lazy=True)
+        this_year.regular_boxes_cache = self.player_boxes("001", "2023-01-01", [30, 10])
+        this_year.update_timestamp_regular_boxes = datetime(2023, 1, 1)
+        first = this_year.regular_boxes_summary
+        version = this_year.regular_boxes_version
+        self.assertIs(this_year.regular_boxes_summary, first)
+        with patch("objects.year.nba_requests.call",
+                   return_value=[self.player_boxes("002", "2023-01-03", [20, 30])]), \
+                patch.object(year, "playoff_game_data", new_callable=PropertyMock,
+                             return_value=pd.DataFrame()), \
+                patch("objects.year.datetime.datetime") as fake_datetime:
+            fake_datetime.now.return_value = datetime(2023, 1, 5)
+            second = this_year.regular_boxes_summary
+        self.assertEqual(this_year.regular_boxes_version, version + 1)
+        self.assertIsNot(second, first)
+        self.assertListEqual(first.MIN_mean.tolist(), [30, 10])
+        self.assertListEqual(second.MIN_mean.tolist(), [25, 20])
+
+
+class TestLazyYear(unittest.TestCase):
+
+    def test_lazy_year_loads_nothing_until_prefetch(self):
+        new_games = TestIncrementalIngest.long_games("001", "2019-01-01", 100, 90)
+        with patch("objects.year.nba_requests.call", return_value=[new_games]) as call:
+            this_year = year(2018, lazy=True)
+            call.assert_not_called()
+            this_year.prefetch(["game_data"])
+        call.assert_called_once()
+        self.assertListEqual(this_year.game_data_cache.GAME_ID.tolist(), ["001"])
+        self.assertTrue(this_year.playoff_boxes_cache.empty)
+
+
+class TestRosterIndex(unittest.TestCase):
+
+    def test_position_masks_and_classes(self):
+        this_year = year.__new__(year)
+        this_year.roster_index_cache, this_year.roster_index_source = dict(), None
+        this_year.roster_index_version = 0
+        roster = pd.DataFrame({"TEAM_ID": [1, 1, 1, 2], "PLAYER_ID": [10, 11, 12, 20],
+                               "POSITION": ["G-F", "F", "F", "C"]})
+        with patch.object(year, "roster_info", new_callable=PropertyMock,
+                          return_value=roster):
+            index = this_year.roster_index
+            self.assertIs(this_year.roster_index, index)
+        self.assertDictEqual(index["player_mask"], {10: 3, 11: 2, 12: 2, 20: 4})
+        self.assertListEqual(index["team_players"][1].tolist(), [10, 11, 12])
+        self.assertListEqual(index["class_players"][1][2].tolist(), [11, 12])
+        self.assertNotIn(2, index["class_players"][2])
+
+
+class TestStandings(unittest.TestCase):
+
+    def setUp(self):
+        self.year = year.__new__(year)
+        self.year.standings_cache, self.year.standings_source = pd.DataFrame(), None
+        long_games = TestIncrementalIngest.long_games
+        away_game = long_games("003", "2023-01-05", 90, 80)
+        away_game["MATCHUP"] = ["BOS @ MIA", "MIA vs. BOS"]
+        self.game_data = year.pivot_games(pd.concat([
+            long_games("001", "2023-01-01", 100, 90),
+            long_games("002", "2023-01-03", 95, 99),
+            away_game]))
+
+    def test_standings(self):
+        with patch.object(year, "game_data", new_callable=PropertyMock,
+                          return_value=self.game_data):
+            standings = self.year.standings
+            self.assertIs(self.year.standings, standings)
+            self.assertEqual(self.year.get_team_record("MIA"), 1 / 3)
+            self.assertEqual(self.year.get_home_win_percentage(1610612738), 0.5)
+            self.assertEqual(self.year.get_away_win_percentage(1610612738), 1)
+        boston = standings.loc[1610612738]
+        self.assertListEqual(
+            [boston.HOME_W, boston.HOME_L, boston.ROAD_W, boston.ROAD_L, boston.W, boston.L],
+            [1, 1, 1, 0, 2, 1])
+
+
+class TestReweightCache(unittest.TestCase):
+
+    def test_same_injuries_hit_cache(self):
+        this_year = year.__new__(year)
+        this_year.reweight_cache = OrderedDict()
+        this_year.reweight_cache_maxsize = 1
+        this_year.reweight_cache_hits = this_year.reweight_cache_misses = 0
+        this_year.regular_boxes_summary_version = this_year.roster_index_version = 0
+        summary = pd.DataFrame({"PLAYER_ID": [10, 11, 12], "MIN_mean": [30, 28, 10]})
+        availability = MagicMock()
+        availability.sat_out.side_effect = [[10, 12], [12, 10], [11]]
+        with patch.object(year, "get_team_box_summary", return_value=summary), \
+                patch.object(year, "roster_index", new_callable=PropertyMock,
+                             return_value={"team_players": {1: [10, 11, 12]}}), \
+                patch.object(year, "sit_or_injured_playoff", new_callable=PropertyMock,
+                             return_value=availability), \
+                patch.object(year, "replace_injured_players", return_value="table") as replace:
+            for game_id in ["001", "002", "003"]:
+                self.assertEqual(this_year.reweight_stats(1, game_id, 0, 0), "table")
+        self.assertEqual(replace.call_count, 2)
+        self.assertDictEqual(this_year.reweight_cache_info(),
+                             {"hits": 1, "misses": 2, "size": 1, "maxsize": 1})
+
+
+
+class TestReplacementMinutes(unittest.TestCase):
+
+    @staticmethod
+    def replace(minutes, replacement_ids):
+        """Replace player 10 with the given bench, where every mean is half the player's minutes."""
+        summary = pd.DataFrame({"TEAM_ID": 1, "PLAYER_ID": range(10, 10 + len(minutes))})
+        for stat in ["MIN"] + BOX_STATS:
+            summary[f"{stat}_mean"] = np.asarray(minutes, dtype=float) / 2
+        summary["MIN_mean"] = minutes
+        with patch.object(year, "regular_boxes_summary", new_callable=PropertyMock,
+                          return_value=summary), \
+                patch.object(year, "get_team_box_summary", return_value=summary):
+            return year.__new__(year).reweight_replacements_for_missing_player(
+                replacement_ids, summary[summary.PLAYER_ID != 10], 10
+            ).set_index("PLAYER_ID")
+
+    def test_minutes_redistributed(self):
+        # 36 minutes fill 11 and 12 up to 36 and give the rest to 13
+        replacements = self.replace([36, 30, 20, 10], [11, 12, 13])
+        self.assertDictEqual(replacements.MIN_mean.to_dict(), {11: 36.0, 12: 36.0, 13: 24.0})
+        # other stats scale with the new minutes
+        self.assertAlmostEqual(replacements.at[13, "PTS_mean"], 10 * 24 / 20)
+
+    def test_minutes_capped(self):
+        # nobody is pushed past the injured player's 30 minutes plus one
+        replacements = self.replace([30, 35, 30, 28, 5], [11, 12, 13, 14])
+        self.assertListEqual(replacements.index.tolist(), [12, 13])
+        self.assertAlmostEqual(replacements.at[12, "MIN_mean"], 31)
+        self.assertAlmostEqual(replacements.at[13, "MIN_mean"], 30)
+        # the cap rises a minute at a time until the missing minutes fit
+        replacements = self.replace([40, 38, 35], [11, 12])
+        self.assertDictEqual(replacements.MIN_mean.to_dict(), {11: 43.0, 12: 43.0})
+
+    def test_short_bench_raises(self):
+        with self.assertRaises(KeyError):
+            self.replace([40, 47.5], [11])
+        with self.assertRaises(KeyError):
+            self.replace([40, 30], [])
+
+
 if __name__ == "__main__":
     unittest.main()